@@ -0,0 +1,171 @@
+# backtest.py ────────────────────────────────────────────────────────
+# 예측 모델 walk-forward(rolling-origin) 백테스트: 종목마다 여러 기준일에서
+# 과거만으로 학습 → 이후 horizon일을 예측해 MAPE / 구간 포함률과
+# 학습·예측 소요 시간을 모델 설정별로 비교한다. (종목 × 설정)을 프로세스 풀에 분산.
+#
+#   python backtest.py                       # 저장소(.cache/prices)의 모든 종목
+#   python backtest.py --tickers AAPL MSFT --horizon 30 --cutoffs 8 --out bt.csv
+# ─────────────────────────────────────────────────────────────────
+import argparse
+import importlib.util
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from fast_forecast import fit_predict
+from forecast_models import PROPHET_PARAMS
+from stock_data import STORE_DIR, PriceStore
+
+# 비교할 기본 설정: Prophet 변화점 민감도 몇 가지 + NumPy 엔진
+DEFAULT_CONFIGS = [
+    {"engine": "prophet", "changepoint_prior_scale": 0.05},
+    {"engine": "prophet", "changepoint_prior_scale": 0.2},
+    {"engine": "prophet", "changepoint_prior_scale": 0.5},
+    {"engine": "numpy", "half_life": 90.0},
+    {"engine": "numpy", "half_life": 180.0},
+]
+
+PROPHET_OK = importlib.util.find_spec("prophet") is not None
+
+
+def available_configs(configs) -> list:
+    """설치되지 않은 엔진(Prophet)의 설정을 뺀 목록."""
+    return [c for c in configs if c["engine"] != "prophet" or PROPHET_OK]
+
+
+def config_name(config: dict) -> str:
+    params = ", ".join(f"{k}={v}" for k, v in config.items() if k != "engine")
+    return f"{config['engine']}({params})"
+
+
+def cutoff_dates(ds: pd.Series, horizon: int, n_cutoffs: int,
+                 period: int, initial: int) -> list:
+    """마지막 기준일이 끝에서 horizon일 앞이 되도록 period일 간격의 기준일을 만듭니다.
+
+    학습 구간이 initial일보다 짧아지는 기준일은 버립니다.
+    """
+    last = ds.max() - pd.Timedelta(days=horizon)
+    cutoffs = [last - pd.Timedelta(days=period * i) for i in range(n_cutoffs)]
+    first_allowed = ds.min() + pd.Timedelta(days=initial)
+    return sorted(c for c in cutoffs if c >= first_allowed)
+
+
+def _fit_and_predict(config: dict, train: pd.DataFrame, test_ds: pd.Series):
+    """설정에 맞는 모델로 학습·예측하고 (예측 프레임, 학습 초, 예측 초)를 반환합니다."""
+    params = {k: v for k, v in config.items() if k != "engine"}
+    if config["engine"] == "prophet":
+        from prophet import Prophet
+        t0 = time.perf_counter()
+        model = Prophet(**{**PROPHET_PARAMS, **params})
+        model.fit(train)
+        t1 = time.perf_counter()
+        pred = model.predict(pd.DataFrame({"ds": test_ds}))
+        return pred, t1 - t0, time.perf_counter() - t1
+
+    # NumPy 엔진은 적합과 예측이 행렬 연산 한 번이라 전부 학습 시간에 합산
+    t0 = time.perf_counter()
+    frame = train.set_index("ds")["y"].to_frame("y")
+    periods = int((test_ds.max() - train["ds"].max()).days)
+    pred = fit_predict(frame, periods, **params)["y"]
+    elapsed = time.perf_counter() - t0
+    return pred[pred["ds"].isin(test_ds)], elapsed, 0.0
+
+
+def _backtest_worker(ticker: str, ds, y, config: dict, horizon: int,
+                     n_cutoffs: int, period: int, initial: int) -> list:
+    """프로세스 풀 작업: 한 종목 × 한 설정의 모든 기준일을 평가합니다."""
+    logging.getLogger("cmdstanpy").setLevel(logging.WARNING)
+    s = pd.DataFrame({"ds": pd.to_datetime(ds), "y": y})
+    rows = []
+    for cutoff in cutoff_dates(s["ds"], horizon, n_cutoffs, period, initial):
+        train = s[s["ds"] <= cutoff]
+        test = s[(s["ds"] > cutoff) & (s["ds"] <= cutoff + pd.Timedelta(days=horizon))]
+        if test.empty:
+            continue
+        pred, fit_sec, predict_sec = _fit_and_predict(config, train, test["ds"])
+        merged = test.merge(pred[["ds", "yhat", "yhat_lower", "yhat_upper"]], on="ds")
+        err = np.abs(merged["y"] - merged["yhat"]) / np.abs(merged["y"])
+        covered = (merged["y"] >= merged["yhat_lower"]) & (merged["y"] <= merged["yhat_upper"])
+        rows.append({
+            "config": config_name(config), "ticker": ticker, "cutoff": cutoff,
+            "n_test": len(merged), "mape": err.mean(), "coverage": covered.mean(),
+            "fit_sec": fit_sec, "predict_sec": predict_sec,
+        })
+    return rows
+
+
+def run_backtest(prices: pd.DataFrame, configs=None, horizon: int = 30,
+                 n_cutoffs: int = 8, period: int = 30, initial: int = 365,
+                 max_workers=None) -> pd.DataFrame:
+    """`prices`(날짜 × 종목) 전체에 대해 설정별 walk-forward 백테스트를 실행합니다.
+
+    기준일별 한 행(config, ticker, cutoff, n_test, mape, coverage, fit_sec,
+    predict_sec)의 DataFrame을 반환합니다. `configs`를 생략하면 설치된 엔진의 기본 설정을 씁니다.
+    """
+    configs = available_configs(DEFAULT_CONFIGS if configs is None else configs)
+    if not configs:
+        raise ValueError("no backtest configs available (is prophet installed?)")
+    rows = []
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = []
+        for ticker in prices.columns:
+            s = prices[ticker].dropna()
+            if s.empty:
+                continue
+            for config in configs:
+                futures.append(pool.submit(
+                    _backtest_worker, str(ticker), s.index.to_numpy(), s.to_numpy(),
+                    config, horizon, n_cutoffs, period, initial))
+        for future in as_completed(futures):
+            rows.extend(future.result())
+    results = pd.DataFrame(rows)
+    if results.empty:
+        return results
+    return results.sort_values(["config", "ticker", "cutoff"], ignore_index=True)
+
+
+def summarize(results: pd.DataFrame) -> pd.DataFrame:
+    """설정별 평균 MAPE / 구간 포함률 / 학습·예측 시간 요약."""
+    return (results.groupby("config")
+            .agg(mape=("mape", "mean"), coverage=("coverage", "mean"),
+                 fit_sec=("fit_sec", "mean"), predict_sec=("predict_sec", "mean"),
+                 runs=("mape", "size"))
+            .sort_values("mape"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="예측 모델 walk-forward 백테스트")
+    parser.add_argument("--tickers", nargs="*",
+                        help="평가할 티커 (기본: 가격 저장소에 있는 전 종목)")
+    parser.add_argument("--horizon", type=int, default=30)
+    parser.add_argument("--cutoffs", type=int, default=8)
+    parser.add_argument("--period", type=int, default=30, help="기준일 간격 (일)")
+    parser.add_argument("--initial", type=int, default=365, help="최소 학습 기간 (일)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", help="기준일별 결과를 저장할 CSV 경로")
+    args = parser.parse_args()
+
+    # 페이지가 쌓아 둔 디스크 가격 저장소를 그대로 재사용 (네트워크 요청 없음)
+    store = PriceStore()
+    tickers = args.tickers or sorted(p.stem for p in STORE_DIR.glob("*.parquet"))
+    if not tickers:
+        parser.error(f"가격 저장소({STORE_DIR})가 비어 있습니다. 주식 페이지를 한 번 열어 데이터를 받은 뒤 실행하세요.")
+    if not PROPHET_OK:
+        print("prophet이 설치되지 않아 NumPy 엔진 설정만 평가합니다.")
+    prices = pd.concat({tic: store.read(tic) for tic in tickers}, axis=1)
+
+    results = run_backtest(prices, horizon=args.horizon, n_cutoffs=args.cutoffs,
+                           period=args.period, initial=args.initial,
+                           max_workers=args.workers)
+    if results.empty:
+        parser.exit(1, "평가할 기준일이 없습니다. 종목 이력이 initial + horizon일보다 짧은지 확인하세요.\n")
+    if args.out:
+        results.to_csv(args.out, index=False)
+    print(summarize(results).to_string(float_format=lambda v: f"{v:.4f}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# forecast_models.py ─────────────────────────────────────────────────
+# Prophet 모델 영속화: 학습된 모델을 (티커, 마지막 학습일) 단위로 디스크에
+# JSON으로 저장해 두고, 재시작 후에는 다시 학습하지 않고 불러온다.
+# ModelRegistry는 전 종목 학습을 프로세스 풀에서 미리 돌려 둔다.
+# ─────────────────────────────────────────────────────────────────
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+MODEL_DIR = Path(__file__).resolve().parent / ".cache" / "models"
+
+# 페이지에서 쓰는 Prophet 설정 (저장된 모델은 모두 이 설정으로 학습됨)
+PROPHET_PARAMS = dict(daily_seasonality=False,
+                      yearly_seasonality=True,
+                      changepoint_prior_scale=0.2)
+
+
+def _model_path(model_dir: Path, ticker: str, last_date) -> Path:
+    return Path(model_dir) / f"{ticker}_{pd.Timestamp(last_date):%Y%m%d}.json"
+
+
+def stan_init(model) -> dict:
+    """학습된 모델의 파라미터를 다음 fit의 초기값(warm-start)으로 꺼냅니다."""
+    res = {}
+    for pname in ["k", "m", "sigma_obs"]:
+        res[pname] = model.params[pname][0][0]
+    for pname in ["delta", "beta"]:
+        res[pname] = model.params[pname][0]
+    return res
+
+
+def load_or_train(ticker: str, train_df: pd.DataFrame, model_dir=MODEL_DIR):
+    """(티커, 마지막 학습일) 모델이 디스크에 있으면 불러오고, 없으면 학습해 저장합니다.
+
+    `train_df`는 Prophet 형식(ds, y)입니다. 새 가격 행이 들어와 마지막 학습일이
+    바뀐 경우에만 다시 학습하며, 이전 날짜의 모델이 남아 있으면 그 파라미터로
+    warm-start 해 수렴을 앞당깁니다.
+    """
+    from prophet import Prophet
+    from prophet.serialize import model_from_json, model_to_json
+
+    model_dir = Path(model_dir)
+    path = _model_path(model_dir, ticker, train_df["ds"].max())
+    if path.exists():
+        return model_from_json(path.read_text())
+
+    previous = sorted(model_dir.glob(f"{ticker}_*.json"))
+    init = None
+    if previous:
+        try:
+            init = stan_init(model_from_json(previous[-1].read_text()))
+        except Exception:
+            init = None  # 손상되었거나 형식이 다른 파일은 무시하고 새로 학습
+
+    model = Prophet(**PROPHET_PARAMS)
+    try:
+        model.fit(train_df, init=init) if init else model.fit(train_df)
+    except Exception:
+        if init is None:
+            raise
+        # 변화점 개수 등이 달라 초기값 모양이 맞지 않으면 처음부터 학습
+        model = Prophet(**PROPHET_PARAMS)
+        model.fit(train_df)
+
+    model_dir.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(model_to_json(model))
+    tmp.replace(path)
+    for old in previous:
+        old.unlink(missing_ok=True)
+    return model
+
+
+def _fit_worker(ticker: str, ds, y, model_dir: str) -> str:
+    """프로세스 풀 작업: 모델을 불러오거나 학습한 뒤 JSON 문자열로 돌려줍니다."""
+    from prophet.serialize import model_to_json
+    train_df = pd.DataFrame({"ds": ds, "y": y})
+    return model_to_json(load_or_train(ticker, train_df, model_dir))
+
+
+# ───── 백그라운드 학습 레지스트리 ─────
+class ModelRegistry:
+    """전 종목 Prophet 모델을 프로세스 풀에서 미리 학습해 두는 공유 저장소.
+
+    `submit`은 (티커, 마지막 학습일)마다 한 번만 작업을 예약하므로 매 rerun
+    호출해도 되고, 데이터가 갱신되어 마지막 날짜가 바뀌면 그 종목만 다시
+    학습합니다. 페이지는 `get`으로 준비된 모델만 즉시 가져가고, 아직 학습 중인
+    종목만 `wait`으로 기다립니다.
+    """
+
+    def __init__(self, model_dir=MODEL_DIR, max_workers=None):
+        self.model_dir = Path(model_dir)
+        # 스트림릿 서버는 멀티스레드라 fork 대신 spawn으로 워커를 띄운다
+        self._pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"))
+        self._lock = threading.Lock()
+        self._models = {}   # ticker -> (last_date, model)
+        self._pending = {}  # ticker -> (last_date, Future)
+
+    def submit(self, ticker: str, train_df: pd.DataFrame) -> None:
+        """`train_df`(ds, y)의 마지막 날짜 기준 모델이 없거나 학습이 실패했으면 예약합니다."""
+        last_date = train_df["ds"].max()
+        with self._lock:
+            ready = self._models.get(ticker)
+            pending = self._pending.get(ticker)
+            if ready and ready[0] == last_date:
+                return
+            # 같은 날짜 작업이라도 실패로 끝났으면 다시 예약 (안 그러면 날짜가 바뀔 때까지 계속 실패)
+            if pending and pending[0] == last_date and not (
+                    pending[1].done() and pending[1].exception() is not None):
+                return
+            future = self._pool.submit(_fit_worker, ticker,
+                                       train_df["ds"].to_numpy(),
+                                       train_df["y"].to_numpy(),
+                                       str(self.model_dir))
+            self._pending[ticker] = (last_date, future)
+
+    def submit_all(self, frames: dict) -> None:
+        """티커 → 학습 데이터(ds, y) 전체를 예약합니다."""
+        for ticker, train_df in frames.items():
+            self.submit(ticker, train_df)
+
+    def _collect(self, ticker: str, block: bool):
+        from prophet.serialize import model_from_json
+        with self._lock:
+            pending = self._pending.get(ticker)
+        if pending is not None and (block or pending[1].done()):
+            model = model_from_json(pending[1].result())  # 학습 실패 시 예외 전파
+            with self._lock:
+                if self._pending.get(ticker) is pending:
+                    del self._pending[ticker]
+                    self._models[ticker] = (pending[0], model)
+        return self._models.get(ticker)
+
+    def get(self, ticker: str, last_date):
+        """준비된 모델을 반환하고, 아직 학습 중이면 None을 반환합니다 (대기 없음)."""
+        entry = self._collect(ticker, block=False)
+        if entry and entry[0] == last_date:
+            return entry[1]
+        return None
+
+    def wait(self, ticker: str, last_date):
+        """해당 모델의 학습이 끝날 때까지 기다렸다가 반환합니다."""
+        model = self.get(ticker, last_date)
+        if model is None:
+            entry = self._collect(ticker, block=True)
+            if entry is None or entry[0] != last_date:
+                raise KeyError(f"{ticker} ({last_date}) 모델이 예약되지 않았습니다.")
+            model = entry[1]
+        return model
+
+    def status(self) -> dict:
+        """티커별 상태: 'ready' / 'training' / 'failed'."""
+        with self._lock:
+            pending = dict(self._pending)
+            ready = set(self._models)
+        out = {tic: "ready" for tic in ready}
+        for tic, (_, future) in pending.items():
+            if not future.done():
+                out[tic] = "training"
+            elif future.exception() is not None:
+                out[tic] = "failed"
+            else:
+                out[tic] = "ready"
+        return out
@@ -0,0 +1,99 @@
+# grade_charts.py ────────────────────────────────────────────────────
+# 성적 차트 렌더링: 학생 한 명의 차트를 PNG 바이트로 그려 돌려준다.
+# 과목별 추이는 서브플롯 격자 하나에 모아 그리고, pyplot 전역 상태 없이
+# Figure 객체만 쓰므로 캐시·스레드·프로세스 풀 어디서든 안전하게 호출할 수 있다.
+# `*_figure` 함수는 PDF 등 다른 형식으로 저장할 수 있게 Figure를 그대로 돌려준다.
+# ─────────────────────────────────────────────────────────────────
+import io
+import math
+
+import numpy as np
+from matplotlib import colormaps
+from matplotlib.figure import Figure
+
+GRID_COLS = 3
+
+
+def _to_png(fig: Figure) -> bytes:
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=100, bbox_inches='tight')
+    return buf.getvalue()
+
+
+def _grid(num_subjects: int, row_height: float):
+    rows = math.ceil(num_subjects / GRID_COLS)
+    fig = Figure(figsize=(15, row_height * rows))
+    axes = fig.subplots(rows, GRID_COLS, squeeze=False).ravel()
+    for ax in axes[num_subjects:]:
+        ax.set_visible(False)
+    return fig, axes
+
+
+def average_bar_figure(student: str, subjects: list, averages: np.ndarray) -> Figure:
+    """과목별 평균 점수 막대 그래프."""
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    ax.bar(subjects, averages, color=colormaps['viridis'](np.linspace(0, 1, len(subjects))))
+    ax.set_ylim(0, 100)
+    ax.set_title(f'{student}\'s Average Scores by Subject')
+    ax.set_xlabel('Subject')
+    ax.set_ylabel('Average Score (Points)')
+    return fig
+
+
+def trend_grid_figure(student: str, subjects: list, scores: np.ndarray) -> Figure:
+    """과목별 시험 점수 추이를 서브플롯 격자 하나로. `scores`는 (과목, 시험)."""
+    exams = np.arange(1, scores.shape[1] + 1)
+    fig, axes = _grid(len(subjects), 4)
+    for ax, subject, subject_scores in zip(axes, subjects, scores):
+        ax.plot(exams, subject_scores, marker='o')
+        ax.set_title(f'{subject} Exam Score Trend')
+        ax.set_xlabel('Exam Number')
+        ax.set_ylabel('Score')
+        ax.set_xticks(exams)
+        ax.set_ylim(0, 100)
+    fig.suptitle(f'{student}\'s Exam Score Trend by Subject')
+    return fig
+
+
+def prediction_grid_figure(student: str, subjects: list, scores: np.ndarray,
+                           predicted: np.ndarray, difficulty_label: str,
+                           interval: tuple = None, interval_label: str = 'Interval') -> Figure:
+    """과목별 실제 점수와 다음 시험 예측(빨간 X)을 서브플롯 격자 하나로.
+
+    `interval`로 과목별 (하한, 상한) 배열을 주면 예측 지점에 구간 막대를 함께 그립니다.
+    """
+    exams = np.arange(1, scores.shape[1] + 1)
+    next_exam_num = len(exams) + 1
+    fig, axes = _grid(len(subjects), 5)
+    for j, (ax, subject, subject_scores, pred) in enumerate(zip(axes, subjects, scores, predicted)):
+        ax.plot(exams, subject_scores, marker='o', label='Actual Scores')
+        if interval is not None:
+            lower, upper = interval[0][j], interval[1][j]
+            ax.errorbar(next_exam_num, pred, yerr=[[pred - lower], [upper - pred]],
+                        color='red', alpha=0.5, capsize=6, label=interval_label)
+        ax.plot(next_exam_num, pred, marker='X', color='red', markersize=10,
+                label=f'Predicted Score ({difficulty_label})')
+        ax.set_title(f'{subject} Next Exam Prediction')
+        ax.set_xlabel('Exam Number')
+        ax.set_ylabel('Score')
+        ax.set_xticks(list(exams) + [next_exam_num])
+        ax.set_ylim(0, 100)
+        ax.legend()
+    fig.suptitle(f'{student}\'s Next Exam Prediction')
+    return fig
+
+
+def render_average_bar(student: str, subjects: list, averages: np.ndarray) -> bytes:
+    return _to_png(average_bar_figure(student, subjects, averages))
+
+
+def render_trend_grid(student: str, subjects: list, scores: np.ndarray) -> bytes:
+    return _to_png(trend_grid_figure(student, subjects, scores))
+
+
+def render_prediction_grid(student: str, subjects: list, scores: np.ndarray,
+                           predicted: np.ndarray, difficulty_label: str,
+                           interval: tuple = None, interval_label: str = 'Interval') -> bytes:
+    return _to_png(prediction_grid_figure(student, subjects, scores, predicted, difficulty_label,
+                                          interval, interval_label))
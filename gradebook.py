@@ -0,0 +1,341 @@
+# gradebook.py ───────────────────────────────────────────────────────
+# 성적 데이터 도우미: 점수를 (학생 × 과목 × 시험) uint8 3차원 배열로 보관하고,
+# 다음 시험 점수 예측을 학생·과목 전체에 대해 행렬 연산 한 번으로 계산한다.
+# ─────────────────────────────────────────────────────────────────
+import hashlib
+import uuid
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+
+def exam_columns(subjects: list, num_exams: int) -> list:
+    """와이드 프레임의 컬럼 순서 (과목별 Exam_1 … Exam_n)."""
+    return [f'{subject}_Exam_{n}' for subject in subjects for n in range(1, num_exams + 1)]
+
+
+class Gradebook:
+    """(학생 × 과목 × 시험) 점수를 uint8 3차원 배열 하나로 보관하는 성적부.
+
+    과목 → 배열 위치 색인을 미리 만들어 두어 과목 이름 조회가 O(1)이고,
+    기존 화면(st.dataframe, describe 등)을 위해 같은 메모리를 공유하는 와이드
+    pandas 뷰(`frame`)를 제공합니다. int64 와이드 프레임보다 메모리가 1/8입니다.
+    """
+
+    def __init__(self, scores: np.ndarray, students, subjects: list, key: str = None):
+        if scores.ndim != 3 or scores.shape[:2] != (len(students), len(subjects)):
+            raise ValueError(f"scores shape {scores.shape} does not match "
+                             f"{len(students)} students x {len(subjects)} subjects")
+        self.scores = np.ascontiguousarray(scores, dtype=np.uint8)
+        self.students = pd.Index(students, name='Student_Name')
+        self.subjects = list(subjects)
+        self.subject_index = {subject: j for j, subject in enumerate(self.subjects)}
+        # 캐시 키: 같은 데이터에서 만든 성적부는 같은 키를 갖도록 생성 측에서 지정
+        self.key = key or uuid.uuid4().hex
+
+    @property
+    def num_students(self) -> int:
+        return self.scores.shape[0]
+
+    @property
+    def num_exams(self) -> int:
+        return self.scores.shape[2]
+
+    def student_scores(self, student: str) -> np.ndarray:
+        """학생 한 명의 (과목, 시험) 점수 뷰."""
+        return self.scores[self.students.get_loc(student)]
+
+    @cached_property
+    def frame(self) -> pd.DataFrame:
+        """`scores`와 메모리를 공유하는 와이드 DataFrame (과목별 Exam_1 … Exam_n 컬럼)."""
+        flat = self.scores.reshape(self.num_students, -1)
+        return pd.DataFrame(flat, index=self.students,
+                            columns=exam_columns(self.subjects, self.num_exams), copy=False)
+
+    @cached_property
+    def regression(self) -> 'RegressionStats':
+        """학생 × 과목별 회귀 충분통계량 (`append_exam`이 이어받아 갱신)."""
+        return RegressionStats.from_scores(self.scores)
+
+    @cached_property
+    def raw_predictions(self) -> np.ndarray:
+        """학생 × 과목별 다음 시험 원예측 (난이도·점수 범위 미적용).
+
+        성적부 객체마다 한 번만 계산되며, 난이도 보정과 0~100 제한, 순위는
+        `adjust_predictions`로 읽을 때 적용합니다.
+        """
+        raw = self.regression.predict()
+        raw.flags.writeable = False  # 공유 캐시가 실수로 바뀌지 않도록
+        return raw
+
+    def append_exam(self, new_scores: np.ndarray) -> 'Gradebook':
+        """(학생, 과목) 점수 한 회분을 다음 시험으로 덧붙인 새 성적부를 반환합니다.
+
+        회귀는 전체 이력으로 다시 적합하지 않고 충분통계량에 새 열만 더해
+        학생·과목당 O(1)로 갱신합니다. 원래 성적부(공유 캐시)는 바뀌지 않습니다.
+        """
+        column = np.asarray(new_scores)
+        if column.shape != self.scores.shape[:2]:
+            raise ValueError(f"new exam shape {column.shape} does not match "
+                             f"{self.num_students} students x {len(self.subjects)} subjects")
+        if column.min() < 0 or column.max() > 100:
+            raise ValueError("scores must be within 0-100")
+        column = np.rint(column).astype(np.uint8)
+        scores = np.concatenate([self.scores, column[:, :, None]], axis=2)
+        digest = hashlib.blake2b(column.tobytes(), digest_size=8).hexdigest()
+        appended = Gradebook(scores, self.students, self.subjects,
+                             key=f'{self.key}+exam{scores.shape[2]}-{digest}')
+        appended.regression = self.regression.updated(column)
+        return appended
+
+
+def generate_gradebook(num_students: int, subjects: list, num_exams: int,
+                       seed: int = 42) -> Gradebook:
+    """0~100점 무작위 성적부를 배열 호출 한 번으로 생성합니다.
+
+    같은 `seed`면 항상 같은 데이터가 나오며, 학생 수 백만 명까지도 수 초 안에 만듭니다.
+    """
+    rng = np.random.default_rng(seed)
+    scores = rng.integers(0, 101, size=(num_students, len(subjects), num_exams), dtype=np.uint8)
+    students = [f'Student_{i}' for i in range(1, num_students + 1)]
+    key = f'synthetic-{num_students}-{num_exams}-{seed}-{"|".join(subjects)}'
+    return Gradebook(scores, students, subjects, key=key)
+
+
+# ───── 실제 성적 파일(long 형식) 적재 ─────
+LONG_COLUMNS = ('student', 'subject', 'exam', 'score')
+
+
+def read_long_chunks(source, columns=LONG_COLUMNS, chunksize: int = 1_000_000):
+    """long 형식(학생, 과목, 시험, 점수) CSV/Parquet을 필요한 컬럼만 청크 단위로 읽습니다.
+
+    `source`는 경로 또는 파일 객체(업로드 파일 등)이며, 확장자가 .parquet이면
+    pyarrow로 배치를 순회하고 그 외에는 CSV로 읽습니다. 두 경로 모두 학생은 문자열,
+    과목은 category, 시험은 int32, 점수는 float32로 맞춰 돌려줍니다.
+    """
+    student_col, subject_col, exam_col, score_col = columns
+    dtypes = {student_col: 'string', subject_col: 'category',
+              exam_col: 'int32', score_col: 'float32'}
+    name = str(getattr(source, 'name', source)).lower()
+    if name.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunksize, columns=list(columns)):
+            # 정수 학생 ID도 CSV 경로처럼 문자열로 (성적부 색인·새 시험 추가가 같은 키를 쓰도록)
+            yield batch.to_pandas().astype(dtypes)
+    else:
+        yield from pd.read_csv(source, usecols=list(columns), dtype=dtypes, chunksize=chunksize)
+
+
+class _Codes:
+    """처음 나온 순서대로 값 → 정수 코드를 붙이는 사전 (청크마다 고유값만 조회)."""
+
+    def __init__(self):
+        self.index = {}
+
+    def encode(self, values: pd.Series) -> np.ndarray:
+        local_codes, uniques = pd.factorize(values)
+        if (local_codes < 0).any():
+            raise ValueError(f"'{values.name}' column contains empty values")
+        mapping = np.array([self.index.setdefault(u, len(self.index)) for u in uniques], dtype=np.int64)
+        return mapping[local_codes]
+
+    @property
+    def labels(self) -> list:
+        return list(self.index)
+
+
+def ingest_long_file(source, columns=LONG_COLUMNS, chunksize: int = 1_000_000,
+                     key: str = None) -> Gradebook:
+    """long 형식 성적 파일을 청크 단위로 읽어 성적부로 피벗합니다.
+
+    원본 텍스트 전체를 메모리에 올리지 않고, 청크마다 학생·과목·시험을 정수 코드로
+    바꿔 미리 잡아 둔 uint8 배열(학생 축은 2배씩 확장)에 바로 채웁니다. 과목은 처음
+    나온 순서, 시험은 번호 순으로 정렬되며, 빠진 점수나 0~100 밖의 점수가 있으면
+    ValueError를 냅니다. 같은 (학생, 과목, 시험)이 여러 번 나오면 마지막 값을 씁니다.
+    """
+    student_col, subject_col, exam_col, score_col = columns
+    students, subjects, exams = _Codes(), _Codes(), _Codes()
+    scores = np.zeros((1024, 8, 16), dtype=np.uint8)
+    filled = np.zeros(scores.shape, dtype=bool)
+
+    for chunk in read_long_chunks(source, columns, chunksize):
+        values = chunk[score_col].to_numpy(dtype=np.float32)
+        if np.isnan(values).any() or (values < 0).any() or (values > 100).any():
+            raise ValueError("scores must be present and within 0-100")
+        s = students.encode(chunk[student_col])
+        j = subjects.encode(chunk[subject_col])
+        e = exams.encode(chunk[exam_col])
+
+        needed = (len(students.index), len(subjects.index), len(exams.index))
+        if any(n > c for n, c in zip(needed, scores.shape)):
+            shape = tuple(max(c, 2 * n if axis == 0 else n) for axis, (n, c)
+                          in enumerate(zip(needed, scores.shape)))
+            pad = [(0, new - old) for new, old in zip(shape, scores.shape)]
+            scores, filled = np.pad(scores, pad), np.pad(filled, pad)
+
+        scores[s, j, e] = np.rint(values).astype(np.uint8)
+        filled[s, j, e] = True
+
+    n_students, n_subjects, n_exams = len(students.index), len(subjects.index), len(exams.index)
+    if n_students == 0:
+        raise ValueError("no rows found in the gradebook file")
+    exam_order = np.argsort(exams.labels)  # 시험 번호 순으로 정렬
+    scores = scores[:n_students, :n_subjects, :n_exams][:, :, exam_order]
+    missing = n_students * n_subjects * n_exams - int(filled[:n_students, :n_subjects, :n_exams].sum())
+    if missing:
+        raise ValueError(f"{missing} (student, subject, exam) scores are missing")
+    return Gradebook(scores, [str(x) for x in students.labels], [str(x) for x in subjects.labels], key=key)
+
+
+def pivot_exam_column(frame: pd.DataFrame, gradebook: Gradebook,
+                      columns=('student', 'subject', 'score')) -> np.ndarray:
+    """long 형식(학생, 과목, 점수) 한 회분 시험 결과를 성적부 순서의 (학생, 과목) 배열로 바꿉니다."""
+    student_col, subject_col, score_col = columns
+    s = gradebook.students.get_indexer(frame[student_col].astype(str))
+    j = frame[subject_col].astype(str).map(gradebook.subject_index).fillna(-1).to_numpy(dtype=np.intp)
+    if (s < 0).any() or (j < 0).any():
+        raise ValueError("new exam contains students or subjects not in the gradebook")
+    column = np.full(gradebook.scores.shape[:2], np.nan)
+    column[s, j] = frame[score_col].to_numpy(dtype=float)
+    if np.isnan(column).any():
+        raise ValueError(f"{int(np.isnan(column).sum())} (student, subject) scores are missing")
+    return column
+
+
+class RegressionStats:
+    """시험 번호 x = 1..n에 대한 단순 선형회귀의 누적 충분통계량.
+
+    Σx, Σx², n은 모든 학생·과목이 공유하는 스칼라이고 Σy, Σxy만 (학생, 과목) 배열이라,
+    새 시험이 추가되면 전체 이력을 다시 보지 않고 학생·과목당 O(1)로 갱신됩니다.
+    """
+
+    def __init__(self, n: int, sum_x: float, sum_xx: float,
+                 sum_y: np.ndarray, sum_xy: np.ndarray):
+        self.n = n
+        self.sum_x = sum_x
+        self.sum_xx = sum_xx
+        self.sum_y = sum_y
+        self.sum_xy = sum_xy
+
+    @classmethod
+    def from_scores(cls, scores: np.ndarray) -> 'RegressionStats':
+        """마지막 축이 시험(1..n)인 점수 배열에서 통계량을 한 번에 만듭니다."""
+        n = scores.shape[-1]
+        x = np.arange(1, n + 1, dtype=float)
+        # Σy와 Σxy를 (n × 2) 가중치 행렬 곱 한 번으로 구한다.
+        # uint8 입력은 먼저 실수로 바꿔야 BLAS 경로를 타서 수십 배 빠르고,
+        # 3차원 그대로 곱하면 (학생, 과목)마다 작은 행렬곱이 되므로 2차원으로 펴서 한 번에.
+        flat = np.asarray(scores, dtype=float).reshape(-1, n)
+        sum_y, sum_xy = (flat @ np.column_stack([np.ones(n), x])).T
+        shape = scores.shape[:-1]
+        return cls(n, x.sum(), (x ** 2).sum(), sum_y.reshape(shape), sum_xy.reshape(shape))
+
+    def updated(self, new_scores: np.ndarray) -> 'RegressionStats':
+        """시험 n+1의 점수(앞쪽 축과 같은 모양)를 더한 새 통계량을 반환합니다."""
+        x = self.n + 1
+        y = np.asarray(new_scores, dtype=float)
+        return RegressionStats(x, self.sum_x + x, self.sum_xx + x * x,
+                               self.sum_y + y, self.sum_xy + x * y)
+
+    def predict(self) -> np.ndarray:
+        """n+1번째 시험 점수 예측. 시험이 2회 이상이어야 합니다."""
+        n = self.n
+        slope = (n * self.sum_xy - self.sum_x * self.sum_y) / (n * self.sum_xx - self.sum_x ** 2)
+        intercept = (self.sum_y - slope * self.sum_x) / n
+        return intercept + slope * (n + 1)
+
+
+def predict_next(scores: np.ndarray) -> np.ndarray:
+    """마지막 축(시험 1..n)에 대한 단순 선형회귀로 n+1번째 시험 점수를 예측합니다.
+
+    X가 항상 1..n이라 기울기·절편이 닫힌 형태로 정해지므로, 앞쪽 축(학생, 과목 …)
+    전체를 sklearn 없이 한 번에 계산합니다. 시험이 2회 이상이어야 합니다.
+    """
+    return RegressionStats.from_scores(scores).predict()
+
+
+BOOTSTRAP_CHUNK = 1 << 22  # 청크당 (행 × 재표본) 원소 수 상한 (float64 32MB)
+INTERVAL_LEVEL = 0.9  # 부트스트랩 예측 구간 수준
+# 다음 시험 난이도 → 점수 보정(점)
+DIFFICULTY_ADJUSTMENTS = {
+    'Easy (쉬움)': 5,    # 점수 +5점 효과
+    'Normal (보통)': 0,  # 점수 변화 없음
+    'Hard (어려움)': -5,  # 점수 -5점 효과
+}
+
+
+def bootstrap_weights(n: int, n_boot: int, rng: np.random.Generator) -> np.ndarray:
+    """시험 재표본마다 다음 시험 점수 하나를 뽑는 (n × 재표본) 선형 가중치 행렬.
+
+    재표본은 시험 n개를 복원추출한 횟수(다항분포 카운트)로 표현하며, 카운트가 정해지면
+    가중 회귀의 예측값이 점수에 대해 선형입니다. 여기에 원래 적합의 잔차 하나(무작위
+    시험, 자유도 보정)를 더해 추세 불확실성과 시험 간 잡음을 함께 담은 예측 구간이 되고,
+    잔차 역시 점수의 선형 함수(I - H)라 전체가 점수 @ 가중치 행렬 한 번으로 계산됩니다.
+    한 시험만 뽑혀 기울기를 정할 수 없는 재표본은 제외합니다.
+    """
+    x = np.arange(1, n + 1, dtype=float)
+    counts = rng.multinomial(n, np.full(n, 1 / n), size=n_boot).astype(float)  # (B, n)
+    sx, sxx = counts @ x, counts @ x ** 2
+    denom = n * sxx - sx ** 2
+    counts, sx, denom = counts[denom > 0], sx[denom > 0], denom[denom > 0]
+    lever = (n + 1 - sx / n) / denom
+    trend = (counts * (1 / n + lever[:, None] * (n * x - sx[:, None]))).T
+
+    # 잔차 = 점수 @ (I - H). 적합으로 줄어든 분산을 sqrt(n / (n - 2))로 보정
+    design = np.column_stack([np.ones(n), x])
+    hat = design @ np.linalg.solve(design.T @ design, design.T)
+    inflate = np.sqrt(n / (n - 2)) if n > 2 else 1.0
+    residual = (np.eye(n) - hat)[:, rng.integers(0, n, size=trend.shape[1])] * inflate
+    return trend + residual
+
+
+def bootstrap_intervals(scores: np.ndarray, n_boot: int = 1000, level: float = INTERVAL_LEVEL,
+                        seed: int = 0):
+    """시험 부트스트랩으로 다음 시험 점수의 (하한, 상한) 예측 구간을 전체 학생·과목에 대해 구합니다.
+
+    모든 재표본을 행렬 곱 한 번((학생·과목 × n) @ (n × 재표본))으로 처리하고,
+    메모리가 커지지 않도록 학생 축만 청크로 나눕니다. 시험이 2회 이상이어야 합니다.
+    """
+    n = scores.shape[-1]
+    weights = bootstrap_weights(n, n_boot, np.random.default_rng(seed))
+    flat = scores.reshape(-1, n)
+    bounds = np.empty((len(flat), 2))
+    tails = [(1 - level) / 2, (1 + level) / 2]
+    step = max(1, BOOTSTRAP_CHUNK // weights.shape[1])
+    for start in range(0, len(flat), step):
+        preds = np.asarray(flat[start:start + step], dtype=float) @ weights
+        bounds[start:start + step] = np.quantile(preds, tails, axis=1).T
+    lower, upper = bounds.T.reshape((2,) + scores.shape[:-1])
+    return lower, upper
+
+
+def adjust_predictions(raw: np.ndarray, difficulty_adjustment: float) -> np.ndarray:
+    """원예측에 난이도 보정(±점)을 더하고 0~100점으로 제한합니다."""
+    return np.clip(raw + difficulty_adjustment, 0, 100)
+
+
+def top_k(values: np.ndarray, k: int):
+    """1차원 `values`에서 큰 순서로 상위 k개의 위치와 순위를 반환합니다 (동점 포함).
+
+    argpartition으로 k번째 값을 O(n)에 찾은 뒤 그 값 이상인 후보만 정렬하므로
+    전체 정렬 없이 동작합니다. k번째와 동점인 항목은 모두 포함되어 결과가 k개보다
+    많을 수 있습니다. 순위는 동점이면 같은 값(1, 2, 2, 4 …)이고 동점끼리는 앞 위치가 먼저입니다.
+    """
+    n = len(values)
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    kth_value = values[np.argpartition(values, n - k)[n - k]]
+    candidates = np.flatnonzero(values >= kth_value)
+    order = candidates[np.lexsort((candidates, -values[candidates]))]
+    descending = -values[order]
+    ranks = np.searchsorted(descending, descending, side='left') + 1
+    return order, ranks
+
+
+def leaderboard(values: np.ndarray, students: pd.Index, k: int) -> pd.DataFrame:
+    """상위 k명(동점 포함)의 Rank / Student / Predicted Score 표."""
+    order, ranks = top_k(values, k)
+    return pd.DataFrame({'Rank': ranks, 'Student': students[order],
+                         'Predicted Score': values[order].round(2)})
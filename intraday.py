@@ -0,0 +1,142 @@
+# intraday.py ────────────────────────────────────────────────────────
+# 인트라데이 OHLCV 피라미드: 가장 촘촘한 1분봉만 한 번 저장하고, 5분·1시간·1일봉은
+# 바로 아래 단계에서 새 봉이 들어온 꼬리 구간만 다시 집계해 갱신한다.
+# 단계 사이를 오가도 재다운로드나 전체 재집계가 없다.
+#
+# 데이터 소스: yfinance 1분봉(최근 7일) 또는 로컬 CSV/Parquet 파일 재생(오프라인 테스트)
+# ─────────────────────────────────────────────────────────────────
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+# (단계 이름, resample 규칙) — 촘촘한 순서. 첫 단계가 원본 봉.
+PYRAMID = (("1m", "1min"), ("5m", "5min"), ("1h", "1h"), ("1d", "1D"))
+COLUMNS = ["open", "high", "low", "close", "volume"]
+YF_WINDOW = pd.Timedelta(days=7)  # yfinance 1분봉은 최근 7일 치만 제공
+AGG = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+
+
+def _normalize(bars: pd.DataFrame) -> pd.DataFrame:
+    """컬럼명을 소문자 OHLCV로 맞추고 시간순으로 정렬합니다."""
+    bars = bars.rename(columns=str.lower)[COLUMNS]
+    bars = bars[~bars.index.duplicated(keep="last")]
+    return bars if bars.index.is_monotonic_increasing else bars.sort_index()
+
+
+def _resample(bars: pd.DataFrame, rule: str) -> pd.DataFrame:
+    return bars.resample(rule).agg(AGG).dropna(subset=["close"])
+
+
+class BarPyramid:
+    """1분봉 → 5분 → 1시간 → 1일 OHLCV 단계를 증분으로 유지합니다.
+
+    여러 세션이 같은 피라미드를 공유할 수 있도록 갱신은 잠금 안에서 일어납니다.
+    """
+
+    def __init__(self, bars: pd.DataFrame = None):
+        self.levels = {name: pd.DataFrame(columns=COLUMNS, dtype="float64") for name, _ in PYRAMID}
+        self.checked_at = None  # 소스에 마지막으로 요청한 시각 (빈 결과도 기록해 재요청 간격 조절)
+        self._lock = threading.Lock()
+        if bars is not None and not bars.empty:
+            self.append(bars)
+
+    @property
+    def last_time(self):
+        """가장 최근 1분봉 시각 (없으면 None)."""
+        base = self.levels[PYRAMID[0][0]]
+        return base.index[-1] if len(base) else None
+
+    def append(self, bars: pd.DataFrame) -> None:
+        """새 1분봉(같은 시각이면 덮어씀)을 더하고 상위 단계의 영향받는 꼬리 구간만 다시 집계합니다.
+
+        진행 중인 봉이 갱신되어 다시 들어와도 마지막 값으로 교체됩니다.
+        """
+        bars = _normalize(bars)
+        if bars.empty:
+            return
+        with self._lock:
+            self._append(bars)
+
+    def _append(self, bars: pd.DataFrame) -> None:
+        base_name = PYRAMID[0][0]
+        base = self.levels[base_name]
+        if len(base):
+            merged = pd.concat([base, bars])
+            merged = merged[~merged.index.duplicated(keep="last")]
+            base = merged if merged.index.is_monotonic_increasing else merged.sort_index()
+        else:
+            base = bars
+        self.levels[base_name] = base
+
+        # 바뀐 첫 시각이 속한 구간부터만 바로 아래 단계에서 다시 집계
+        since = bars.index[0]
+        finer = base
+        for name, rule in PYRAMID[1:]:
+            since = since.floor(rule)
+            tail = _resample(finer[finer.index >= since], rule)
+            current = self.levels[name]
+            self.levels[name] = pd.concat([current[current.index < since], tail]) if len(current) else tail
+            finer = self.levels[name]
+
+    def bars(self, level: str, last: int = None) -> pd.DataFrame:
+        """`level` 단계의 봉 (`last`를 주면 최근 그 개수만)."""
+        frame = self.levels[level]
+        return frame if last is None else frame.iloc[-last:]
+
+
+# ───── 데이터 소스 ─────
+def yf_intraday(ticker: str, since=None) -> pd.DataFrame:
+    """yfinance 1분봉. `since`가 있으면 그 시각 이후만, 없으면 받을 수 있는 최근 7일.
+
+    1분봉은 최근 `YF_WINDOW`만 받을 수 있으므로 그보다 오래된 `since`는 그 창의 시작으로
+    당겨지고, 사이 구간은 채워지지 않습니다 (`stale_gap`으로 확인). 여러 세션이 동시에
+    불러도 섞이지 않도록 전역 상태가 없는 `Ticker.history`를 씁니다.
+    """
+    import yfinance as yf  # 인트라데이 모드에서만 필요
+    history = yf.Ticker(ticker).history
+    if since is None or stale_gap(since):
+        raw = history(period="7d", interval="1m", auto_adjust=False)
+    else:
+        raw = history(start=since, interval="1m", auto_adjust=False)
+    if raw.empty:
+        return pd.DataFrame(columns=COLUMNS)
+    return raw[raw.index >= since] if since is not None else raw
+
+
+def stale_gap(since) -> bool:
+    """`since` 이후 구간 일부가 yfinance 1분봉 제공 범위(최근 7일)를 벗어났는지."""
+    return since < pd.Timestamp.now(tz=since.tz) - YF_WINDOW
+
+
+class FileReplay:
+    """로컬 CSV/Parquet 1분봉 파일을 조금씩 흘려보내 실시간 수신을 흉내 냅니다.
+
+    파일에는 시각 컬럼(timestamp/datetime/date 중 하나, 없으면 첫 컬럼)과
+    open, high, low, close, volume 컬럼이 있어야 합니다.
+    """
+
+    def __init__(self, path, bars_per_tick: int = 60):
+        path = Path(path)
+        frame = pd.read_parquet(path) if path.suffix.lower() == ".parquet" else pd.read_csv(path)
+        frame.columns = [str(c).lower() for c in frame.columns]
+        time_col = next((c for c in ("timestamp", "datetime", "date") if c in frame.columns),
+                        frame.columns[0])
+        frame.index = pd.to_datetime(frame.pop(time_col))
+        missing = set(COLUMNS) - set(frame.columns)
+        if missing:
+            raise ValueError(f"replay file is missing columns: {sorted(missing)}")
+        self.frame = _normalize(frame)
+        self.bars_per_tick = bars_per_tick
+        self.position = 0
+
+    @property
+    def done(self) -> bool:
+        return self.position >= len(self.frame)
+
+    def next(self, ticks: int = 1) -> pd.DataFrame:
+        """다음 `ticks` × `bars_per_tick`개의 봉."""
+        end = self.position + ticks * self.bars_per_tick
+        chunk = self.frame.iloc[self.position:end]
+        self.position = min(end, len(self.frame))
+        return chunk
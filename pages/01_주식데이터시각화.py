@@ -1,17 +1,19 @@
 # app.py  ──────────────────────────────────────────────────────────
 # 글로벌 시가총액 Top-10 기업: 최근 3년 시각화 + 단기 예측(거시 변수 X)
 # ─────────────────────────────────────────────────────────────────
+import importlib.util
 import streamlit as st
-import yfinance as yf
 import pandas as pd
 from datetime import date, timedelta
 
+from fast_forecast import fit_predict
+from forecast_models import ModelRegistry
+from price_levels import LEVEL_LABELS, PriceLevels
+from stock_data import PriceStore
+
 # Prophet ─────────────────────────────────────────────────────────
-try:
-    from prophet import Prophet
-    PROPHET_OK = True
-except ImportError:
-    PROPHET_OK = False
+# 설치 여부만 확인하고, 실제 import(cmdstanpy 포함)는 학습 워커에서 일어난다
+PROPHET_OK = importlib.util.find_spec("prophet") is not None
 
 # ───── 기본 설정 ─────
 st.set_page_config(page_title="Top-10 Stocks: Trend & Forecast",
@@ -33,24 +35,22 @@ TICKERS = {
 
 TODAY  = date.today()
 START  = TODAY - timedelta(days=365*3)
+MAX_HORIZON = 180   # 예측은 최대 기간으로 한 번만 계산하고 슬라이더 값만큼 잘라 쓴다
 
-# ───── 가격 시리즈 함수 ─────
+# ───── 가격 데이터 (디스크 저장소 + 증분 갱신) ─────
+# 날짜를 캐시 키에 넣어 하루 한 번은 저장소를 통해 새 행만 받아온다
 @st.cache_data(show_spinner="📥 데이터 다운로드 중…")
-def get_series(ticker: str) -> pd.Series:
-    df = yf.download(ticker, start=START, end=TODAY,
-                     progress=False, auto_adjust=True)
-    if df.empty:
-        return pd.Series(dtype="float64", name=ticker)
-    if isinstance(df.columns, pd.MultiIndex):
-        close = df.xs("Close", axis=1, level=0).iloc[:, 0]
-    else:
-        close = df["Close"]
-    return close.rename(ticker).ffill().bfill()
-
-prices = pd.concat(
-    {name: get_series(tic) for name, tic in TICKERS.items()},
-    axis=1
-)
+def get_prices(today: date) -> pd.DataFrame:
+    return PriceStore().prices(TICKERS, START, today)
+
+prices = get_prices(TODAY)
+
+# 일/주/월 OHLC 단계를 하루 한 번 미리 만들어 두고, 보이는 기간에 맞는 단계만 차트로 보낸다
+@st.cache_resource(max_entries=2) # 날짜가 바뀌면 전날 단계는 버린다
+def get_levels(today: date) -> PriceLevels:
+    return PriceLevels(get_prices(today))
+
+levels = get_levels(TODAY)
 
 # ───── 사이드바 옵션 ─────
 st.sidebar.header("⚙️  옵션")
@@ -61,10 +61,15 @@ sel_stocks = st.sidebar.multiselect("표시할 기업",
                                     default=list(TICKERS.keys()))
 
 # ───── 추세 그래프 ─────
-plot_df = prices[sel_stocks]
+first_day, last_day = prices.index[0].date(), prices.index[-1].date()
+view_start, view_end = st.slider("표시 기간", first_day, last_day, (first_day, last_day),
+                                 format="YYYY-MM-DD")
+level, plot_df = levels.window(view_start, view_end)
+plot_df = plot_df[sel_stocks]
 if view_mode.startswith("정규화"):
     plot_df = plot_df / plot_df.iloc[0] * 100
 st.line_chart(plot_df, height=550)
+st.caption(f"해상도: {LEVEL_LABELS[level]} 종가 ({len(plot_df):,}점) — 기간이 길면 주봉·월봉으로 자동 전환")
 
 with st.expander("📄 Raw Data (tail)"):
     st.dataframe(prices.tail(10))
@@ -72,31 +77,80 @@ with st.expander("📄 Raw Data (tail)"):
 # ───── 예측 섹션 ─────
 st.subheader("🔮 미래 주가 예측 (거시 변수 제외)")
 
+ENGINES = {"🔮 Prophet (정확도 우선)": "Prophet",
+           "⚡ NumPy 고속 (추세+연간 계절성)": "NumPy"}
 if not PROPHET_OK:
-    st.error("`prophet` 라이브러리가 설치되지 않았습니다. "
-             "requirements.txt에 `prophet` 추가 후 재배포하세요.")
-    st.stop()
-
-col1, col2 = st.columns(2)
-with col1:
-    tgt_name = st.selectbox("예측할 종목", list(TICKERS.keys()))
-with col2:
-    horizon = st.slider("예측 기간 (일)", 7, 180, 30, step=7)
+    st.info("`prophet` 라이브러리가 설치되지 않아 NumPy 고속 엔진만 사용합니다. "
+            "Prophet 예측을 쓰려면 requirements.txt에 `prophet` 추가 후 재배포하세요.")
+    ENGINES = {k: v for k, v in ENGINES.items() if v != "Prophet"}
 
-@st.cache_data(show_spinner="🔮 모델 학습 중…")
-def train_prophet(target: str):
+def training_frame(target: str) -> pd.DataFrame:
     s = prices[target].dropna().reset_index()
     s.columns = ["ds", "y"]
-    model = Prophet(daily_seasonality=False,
-                    yearly_seasonality=True,
-                    changepoint_prior_scale=0.2)
-    model.fit(s)
-    return model, s
+    return s
+
+train_frames = {name: training_frame(name) for name in TICKERS}
+
+# 전 종목 모델을 프로세스 풀에서 미리 학습 (서버당 하나의 레지스트리를 공유).
+# (티커, 마지막 학습일)마다 한 번만 예약되므로 데이터가 갱신된 종목만 다시 학습한다.
+@st.cache_resource
+def get_registry() -> ModelRegistry:
+    return ModelRegistry()
+
+if PROPHET_OK:
+    registry = get_registry()
+    registry.submit_all({TICKERS[name]: df for name, df in train_frames.items()
+                         if not df.empty})
 
-model, train_df = train_prophet(tgt_name)
+col1, col2, col3 = st.columns(3)
+with col1:
+    tgt_name = st.selectbox("예측할 종목", list(TICKERS.keys()))
+with col2:
+    horizon = st.slider("예측 기간 (일)", 7, MAX_HORIZON, 30, step=7)
+with col3:
+    engine_label = st.radio("예측 엔진", list(ENGINES.keys()))
+engine = ENGINES[engine_label]
+
+# predict()는 구간 추정을 위해 사후 표본을 뽑으므로 가장 느린 단계 → 종목당 한 번만
+@st.cache_data(show_spinner="🔮 예측 계산 중…")
+def predict_max(ticker: str, last_date: pd.Timestamp) -> pd.DataFrame:
+    model = registry.wait(ticker, last_date)
+    future = model.make_future_dataframe(periods=MAX_HORIZON)
+    return model.predict(future)[["ds", "yhat", "yhat_lower", "yhat_upper"]]
+
+# NumPy 엔진은 전 종목을 행렬 연산 한 번으로 적합 (수십 ms)
+@st.cache_data(show_spinner=False)
+def fast_predict_all(last_date: pd.Timestamp) -> dict:
+    return fit_predict(prices, MAX_HORIZON)
+
+ticker   = TICKERS[tgt_name]
+train_df = train_frames[tgt_name]
+last_date = train_df["ds"].max()
+if train_df.empty:
+    st.error(f"{tgt_name}의 가격 데이터가 없어 예측할 수 없습니다.")
+    st.stop()
 
-future    = model.make_future_dataframe(periods=horizon)
-forecast  = model.predict(future)
+if engine == "Prophet":
+    status = registry.status()
+    n_ready = sum(status.get(tic) == "ready" for tic in TICKERS.values())
+    if n_ready < len(TICKERS):
+        st.caption(f"⏳ 백그라운드 모델 학습: {n_ready}/{len(TICKERS)} 종목 준비 완료")
+    try:
+        if registry.get(ticker, last_date) is None:
+            # 워밍업이 끝나지 않은 종목만 학습 완료를 기다린다
+            with st.spinner(f"🔮 {tgt_name} 모델 학습 중… (training…)"):
+                registry.wait(ticker, last_date)
+    except Exception as e:
+        st.error(f"{tgt_name} 모델 학습에 실패했습니다: {e}")
+        st.stop()
+    forecast = predict_max(ticker, last_date)
+else:
+    forecast = fast_predict_all(prices.index[-1])[tgt_name]
+    if forecast["yhat"].isna().all():
+        st.error(f"{tgt_name}의 관측치가 너무 적어 NumPy 엔진으로 예측할 수 없습니다.")
+        st.stop()
+
+forecast = forecast[forecast["ds"] <= last_date + pd.Timedelta(days=horizon)]
 
 # ───── Plotly 시각화 ─────
 import plotly.graph_objects as go
@@ -112,7 +166,7 @@ fig.add_trace(go.Scatter(x=forecast["ds"], y=forecast["yhat_lower"],
                          mode="lines", name="Lower CI",
                          line=dict(dash="dash"), opacity=0.3))
 fig.update_layout(height=550,
-                  title=f"{tgt_name} — Prophet Forecast ({horizon} days)")
+                  title=f"{tgt_name} — {engine} Forecast ({horizon} days)")
 st.plotly_chart(fig, use_container_width=True)
 
 with st.expander("🔎 예측 테이블 (tail)"):
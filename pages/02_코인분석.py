@@ -1,8 +1,13 @@
 import streamlit as st
-import yfinance as yf
 import pandas as pd
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from intraday import PYRAMID, BarPyramid, FileReplay, stale_gap, yf_intraday
+from price_levels import LEVEL_LABELS, PriceLevels
+from stock_data import PriceStore
 
 st.set_page_config(layout="wide")
 
@@ -29,97 +34,217 @@ def get_top_crypto_info():
     }
     return crypto_tickers
 
-crypto_tickers = get_top_crypto_info()
-selected_cryptos = st.multiselect(
-    "가격을 확인하고 싶은 가상화폐를 선택하세요:",
-    options=list(crypto_tickers.keys()),
-    default=list(crypto_tickers.keys()) # 기본값으로 모든 코인 선택
-)
+MAX_WORKERS = 8 # 동시에 내려받을 최대 코인 수
+EMPTY_RETRY = timedelta(minutes=1) # 빈 1분봉 응답 뒤 자동으로 다시 요청하기까지의 간격
 
-end_date = datetime.now() # 현재 시간 기준
-start_date = end_date - timedelta(days=3 * 365) # 최근 3년
+# 선택한 코인 조합별로 일/주/월 OHLC 단계를 한 번만 만들어 두고 기간 슬라이더에서 재사용
+@st.cache_resource(max_entries=20)
+def get_levels(names: tuple, end: date, _data: pd.DataFrame) -> PriceLevels:
+    return PriceLevels(_data)
 
-st.write(f"**데이터 조회 기간:** {start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')}")
-st.markdown("---")
+@st.cache_data(ttl=3600, show_spinner=False) # 코인별 캐싱: 1시간마다 새 행 확인
+def get_coin_close(ticker: str, start: date, end: date) -> pd.Series:
+    # 디스크 저장소에서 읽고, 마지막 저장일 이후 행만 yfinance로 받아 붙입니다.
+    # 미완성 당일 봉이 저장되지 않도록 종료일은 오늘 날짜(미포함)로 넘깁니다.
+    return PriceStore().series(ticker, start, end)
 
-if selected_cryptos:
-    all_crypto_data = {}
-    
-    st.subheader("데이터 로딩 현황")
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-
-    for i, crypto_name in enumerate(selected_cryptos):
-        ticker = crypto_tickers[crypto_name]
-        status_text.info(f"'{crypto_name}' ({ticker}) 데이터 가져오는 중... ({i+1}/{len(selected_cryptos)})")
-        progress_bar.progress((i + 1) / len(selected_cryptos))
-        
-        try:
-            # yfinance에서 주식 데이터를 가져옵니다. 가상화폐도 동일한 함수 사용.
-            ticker_data = yf.download(ticker, start=start_date, end=end_date, progress=False)
-
-            if not ticker_data.empty:
-                if 'Close' in ticker_data.columns:
-                    # Series의 name을 코인 이름으로 설정하여 DataFrame 병합 시 컬럼명으로 사용
-                    all_crypto_data[crypto_name] = ticker_data['Close'].rename(crypto_name)
-                    status_text.success(f"'{crypto_name}' ({ticker}) 데이터 성공적으로 로드 완료.")
+# 인트라데이 피라미드는 (소스, 코인)별로 하나만 만들어 공유: 봉 단위 전환은 메모리 안에서만 일어나고,
+# 새로 받은(또는 재생한) 1분봉만 덧붙여 상위 단계의 꼬리 구간만 다시 집계한다.
+@st.cache_resource(max_entries=20)
+def get_pyramid(source_key: str) -> BarPyramid:
+    return BarPyramid()
+
+@st.cache_resource(max_entries=5)
+def get_replay(path: str, mtime_ns: int) -> FileReplay:
+    return FileReplay(path)
+
+# 인트라데이 보기: 파일 입력이 없거나 읽을 수 없으면 안내만 하고 돌아온다
+def show_intraday(crypto_tickers: dict):
+    st.subheader("인트라데이 가격 (1분봉 → 5분 → 1시간 → 1일)")
+    source_type = st.radio("데이터 소스:", ("yfinance (최근 7일 1분봉)", "로컬 파일 재생"), horizontal=True)
+
+    if source_type.startswith("yfinance"):
+        coin_name = st.selectbox("가상화폐:", list(crypto_tickers.keys()))
+        ticker = crypto_tickers[coin_name]
+        pyramid = get_pyramid(f"yf-{ticker}")
+        st.caption("yfinance 1분봉은 최근 7일 치만 제공됩니다. 그보다 오래 갱신하지 않았다면 그 사이 구간은 비어 있습니다.")
+        # 아직 봉이 없으면 자동으로 받되, 빈 응답이었다면 EMPTY_RETRY 동안은 버튼으로만 다시 요청
+        auto = pyramid.last_time is None and (
+            pyramid.checked_at is None or datetime.now() - pyramid.checked_at > EMPTY_RETRY)
+        if auto or st.button("새 봉 받기"):
+            last_time = pyramid.last_time
+            with st.spinner("1분봉 받는 중…"):
+                try:
+                    # 처음엔 최근 7일, 이후엔 마지막 봉(진행 중일 수 있음)부터만 받아 덧붙임
+                    new_bars = yf_intraday(ticker, last_time)
+                    pyramid.append(new_bars)
+                except Exception as e:
+                    st.error(f"'{coin_name}' ({ticker}) 1분봉을 가져오는 중 오류 발생: {e}")
                 else:
-                    status_text.warning(f"'{crypto_name}' ({ticker})에서 'Close' 가격 데이터를 찾을 수 없습니다. (사용 가능한 컬럼: {ticker_data.columns.tolist()})")
-            else:
-                status_text.warning(f"'{crypto_name}' ({ticker})의 데이터를 가져왔지만 비어있습니다. 해당 기간에 데이터가 없거나 티커가 잘못되었을 수 있습니다.")
-        except Exception as e:
-            status_text.error(f"'{crypto_name}' ({ticker}) 데이터를 가져오는 중 심각한 오류 발생: {e}")
-    
-    progress_bar.empty() # 진행바 제거
-    status_text.empty() # 최종 상태 메시지 제거 (아래 그래프 표시)
-
-    # 데이터 로딩이 하나도 성공하지 못했을 경우 빈 DataFrame으로 초기화
-    if not all_crypto_data:
-        data = pd.DataFrame()
-        st.error("선택된 모든 가상화폐의 데이터를 가져오는 데 실패했습니다. 티커 또는 네트워크 연결을 확인해주세요.")
+                    if new_bars.empty:
+                        st.info(f"'{coin_name}' ({ticker})의 새 1분봉이 없습니다.")
+                    elif last_time is not None and stale_gap(last_time):
+                        st.warning(f"마지막 봉({last_time}) 이후 7일이 넘게 지나 최근 7일 이전 구간은 받을 수 없어 비어 있습니다.")
+                finally:
+                    pyramid.checked_at = datetime.now()
     else:
-        # 모든 Series들을 하나의 DataFrame으로 병합 (인덱스 기준으로 자동 정렬)
-        data = pd.DataFrame(all_crypto_data)
-        # yfinance가 반환하는 인덱스는 이미 datetime 형태이므로 추가 변환 불필요 (안정성 강화)
-        # data.index = pd.to_datetime(data.index)
+        replay_path = st.text_input("1분봉 파일 경로 (.csv / .parquet, timestamp·open·high·low·close·volume 컬럼):").strip()
+        if not replay_path or not os.path.isfile(replay_path):
+            st.info("재생할 1분봉 파일 경로를 입력해주세요.")
+            return
+        mtime_ns = os.stat(replay_path).st_mtime_ns
+        try:
+            replay = get_replay(replay_path, mtime_ns)
+        except (ValueError, OSError) as e:
+            st.error(f"재생 파일을 읽을 수 없습니다: {e}")
+            return
+        pyramid = get_pyramid(f"replay-{replay_path}-{mtime_ns}")
+        if pyramid.last_time is None or st.button("다음 봉 재생", disabled=replay.done):
+            pyramid.append(replay.next())
+        st.caption(f"재생 위치: {replay.position:,} / {len(replay.frame):,}봉 (한 번에 {replay.bars_per_tick}봉)")
+
+    level = st.radio("봉 단위:", [name for name, _ in PYRAMID], index=1, horizontal=True)
+    num_bars = st.slider("표시할 봉 개수 (최근):", 50, 2000, 300, step=50)
+    bars = pyramid.bars(level, num_bars)
+
+    if bars.empty:
+        st.warning("표시할 인트라데이 데이터가 없습니다.")
+    else:
+        import plotly.graph_objects as go # 그릴 데이터가 있을 때만 로드
+        from plotly.subplots import make_subplots
+
+        fig = make_subplots(rows=2, cols=1, shared_xaxes=True, row_heights=[0.75, 0.25], vertical_spacing=0.03)
+        fig.add_trace(go.Candlestick(x=bars.index, open=bars["open"], high=bars["high"],
+                                     low=bars["low"], close=bars["close"], name="가격"), row=1, col=1)
+        fig.add_trace(go.Bar(x=bars.index, y=bars["volume"], name="거래량"), row=2, col=1)
+        fig.update_layout(title=f"{level} 봉 (최근 {len(bars):,}개)", xaxis_rangeslider_visible=False,
+                          height=650, showlegend=False)
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption(f"저장된 1분봉 {len(pyramid.bars(PYRAMID[0][0])):,}개 · 마지막 봉 {pyramid.last_time}")
+
+crypto_tickers = get_top_crypto_info()
+
+view_type = st.radio("보기 방식:", ("일별 종가 (최근 3년)", "인트라데이 (1분~1일봉)"), horizontal=True)
+
+if view_type.startswith("인트라데이"):
+    show_intraday(crypto_tickers)
+else:
+    selected_cryptos = st.multiselect(
+        "가격을 확인하고 싶은 가상화폐를 선택하세요:",
+        options=list(crypto_tickers.keys()),
+        default=list(crypto_tickers.keys()) # 기본값으로 모든 코인 선택
+    )
 
-    if not data.empty:
-        # 모든 데이터가 NaN인 컬럼 제거 (데이터를 가져오지 못한 코인 제거)
-        data = data.dropna(axis=1, how='all')
+    end_date = datetime.now() # 현재 시간 기준
+    start_date = end_date - timedelta(days=3 * 365) # 최근 3년
+
+    st.write(f"**데이터 조회 기간:** {start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')}")
+    st.markdown("---")
+
+    if selected_cryptos:
+        all_crypto_data = {}
+        
+        st.subheader("데이터 로딩 현황")
+        progress_bar = st.progress(0)
+        status_text = st.empty()
+
+        # 코인별 요청을 스레드 풀에서 동시에 보내고, 끝나는 순서대로 진행 상황을 갱신합니다.
+        # 코인별 요청은 전역 상태가 없는 Ticker.history로 받으므로 스레드끼리 결과가 섞이지 않고,
+        # 캐시에 있는 코인은 네트워크 없이 바로 끝납니다.
+        ctx = get_script_run_ctx()
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS,
+                                initializer=lambda: add_script_run_ctx(ctx=ctx)) as pool:
+            futures = {
+                pool.submit(get_coin_close, crypto_tickers[crypto_name],
+                            start_date.date(), end_date.date()): crypto_name
+                for crypto_name in selected_cryptos
+            }
+            for i, future in enumerate(as_completed(futures)):
+                crypto_name = futures[future]
+                ticker = crypto_tickers[crypto_name]
+                progress_bar.progress((i + 1) / len(selected_cryptos))
+
+                try:
+                    close = future.result()
+
+                    if not close.empty:
+                        # Series의 name을 코인 이름으로 설정하여 DataFrame 병합 시 컬럼명으로 사용
+                        all_crypto_data[crypto_name] = close.rename(crypto_name)
+                        status_text.success(f"'{crypto_name}' ({ticker}) 데이터 성공적으로 로드 완료. ({i+1}/{len(selected_cryptos)})")
+                    else:
+                        status_text.warning(f"'{crypto_name}' ({ticker})의 데이터를 가져왔지만 비어있습니다. 해당 기간에 데이터가 없거나 티커가 잘못되었을 수 있습니다.")
+                except Exception as e:
+                    status_text.error(f"'{crypto_name}' ({ticker}) 데이터를 가져오는 중 심각한 오류 발생: {e}")
+
+        # 완료 순서와 관계없이 선택한 순서대로 컬럼을 배치
+        all_crypto_data = {name: all_crypto_data[name]
+                           for name in selected_cryptos if name in all_crypto_data}
+        
+        progress_bar.empty() # 진행바 제거
+        status_text.empty() # 최종 상태 메시지 제거 (아래 그래프 표시)
+
+        # 데이터 로딩이 하나도 성공하지 못했을 경우 빈 DataFrame으로 초기화
+        if not all_crypto_data:
+            data = pd.DataFrame()
+            st.error("선택된 모든 가상화폐의 데이터를 가져오는 데 실패했습니다. 티커 또는 네트워크 연결을 확인해주세요.")
+        else:
+            # 모든 Series들을 하나의 DataFrame으로 병합 (인덱스 기준으로 자동 정렬)
+            data = pd.DataFrame(all_crypto_data)
+            # yfinance가 반환하는 인덱스는 이미 datetime 형태이므로 추가 변환 불필요 (안정성 강화)
+            # data.index = pd.to_datetime(data.index)
 
         if not data.empty:
-            st.subheader("가상화폐 가격 변동 추이 (최근 3년)")
-
-            fig = go.Figure()
-            for col in data.columns:
-                fig.add_trace(go.Scatter(x=data.index, y=data[col], mode='lines', name=col))
-
-            fig.update_layout(
-                title="선택된 가상화폐의 USD 기준 가격 변동",
-                xaxis_title="날짜",
-                yaxis_title="가격 (USD)",
-                hovermode="x unified",
-                legend_title="가상화폐",
-                height=600,
-                # yaxis_type="log" # 가격 차이가 클 경우 로그 스케일 고려
-            )
-            st.plotly_chart(fig, use_container_width=True)
-
-            st.subheader("가격 데이터 (상위 5개 행)")
-            st.dataframe(data.head())
-
-            st.subheader("가격 데이터 (하위 5개 행)")
-            st.dataframe(data.tail())
-
-            st.subheader("기술 통계")
-            st.dataframe(data.describe())
+            # 모든 데이터가 NaN인 컬럼 제거 (데이터를 가져오지 못한 코인 제거)
+            data = data.dropna(axis=1, how='all')
+
+            if not data.empty:
+                import plotly.graph_objects as go # 그릴 데이터가 있을 때만 로드
+
+                st.subheader("가상화폐 가격 변동 추이 (최근 3년)")
+
+                # 보이는 기간에 맞춰 일봉/주봉/월봉을 골라 코인당 점 수를 제한
+                levels = get_levels(tuple(data.columns), end_date.date(), data)
+                first_day, last_day = data.index[0].date(), data.index[-1].date()
+                view_start, view_end = st.slider("표시 기간", first_day, last_day, (first_day, last_day),
+                                                 format="YYYY-MM-DD")
+                level, view = levels.window(view_start, view_end)
+                _, view_high = levels.window(view_start, view_end, "high", level)
+                _, view_low = levels.window(view_start, view_end, "low", level)
+
+                fig = go.Figure()
+                for col in view.columns:
+                    # 주봉·월봉이면 구간 최고/최저가를 hover에 함께 표시
+                    fig.add_trace(go.Scatter(x=view.index, y=view[col], mode='lines', name=col,
+                                             customdata=pd.concat([view_high[col], view_low[col]], axis=1),
+                                             hovertemplate="%{y:,.4g} (H %{customdata[0]:,.4g} / L %{customdata[1]:,.4g})"))
+
+                fig.update_layout(
+                    title="선택된 가상화폐의 USD 기준 가격 변동",
+                    xaxis_title="날짜",
+                    yaxis_title="가격 (USD)",
+                    hovermode="x unified",
+                    legend_title="가상화폐",
+                    height=600,
+                    # yaxis_type="log" # 가격 차이가 클 경우 로그 스케일 고려
+                )
+                st.plotly_chart(fig, use_container_width=True)
+                st.caption(f"해상도: {LEVEL_LABELS[level]} ({len(view):,}점) — 기간이 길면 주봉·월봉으로 자동 전환")
+
+                st.subheader("가격 데이터 (상위 5개 행)")
+                st.dataframe(data.head())
+
+                st.subheader("가격 데이터 (하위 5개 행)")
+                st.dataframe(data.tail())
+
+                st.subheader("기술 통계")
+                st.dataframe(data.describe())
+            else:
+                st.warning("선택된 가상화폐들 중 유효한 가격 데이터를 가진 코인이 없습니다.")
         else:
-            st.warning("선택된 가상화폐들 중 유효한 가격 데이터를 가진 코인이 없습니다.")
+            # 이 else 블록은 위에 추가된 not all_crypto_data 확인으로 인해 거의 도달하지 않을 것임.
+            st.error("데이터를 시각화할 수 없습니다. 유효한 코인 데이터가 로드되지 않았습니다.")
     else:
-        # 이 else 블록은 위에 추가된 not all_crypto_data 확인으로 인해 거의 도달하지 않을 것임.
-        st.error("데이터를 시각화할 수 없습니다. 유효한 코인 데이터가 로드되지 않았습니다.")
-else:
-    st.info("가격을 확인하고 싶은 가상화폐를 하나 이상 선택해주세요.")
+        st.info("가격을 확인하고 싶은 가상화폐를 하나 이상 선택해주세요.")
 
 st.markdown(
     """
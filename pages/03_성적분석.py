@@ -1,11 +1,14 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.linear_model import LinearRegression
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_absolute_error, r2_score
+import os
+import tempfile
+import time
+# matplotlib(grade_charts)은 무거워서 실제로 차트를 그릴 때 import 합니다.
+
+from gradebook import (DIFFICULTY_ADJUSTMENTS, INTERVAL_LEVEL, LONG_COLUMNS, Gradebook,
+                       adjust_predictions, bootstrap_intervals, generate_gradebook,
+                       ingest_long_file, leaderboard, pivot_exam_column)
 
 # Streamlit 페이지 설정은 모든 import 문 바로 다음에 와야 합니다.
 st.set_page_config(layout="wide", page_title="학생 성적 분석 및 예측 시스템")
@@ -16,28 +19,132 @@ subjects_korean = ['국어', '영어', '수학', '역사', '사회', '과학']
 subjects_english = ['Korean', 'English', 'Math', 'History', 'Social', 'Science']
 subject_map = dict(zip(subjects_korean, subjects_english))
 
-num_students = 150
-num_exams = 10 # 각 과목별 시험 횟수
-
-@st.cache_data # 데이터프레임이 변경되지 않는 한 캐싱하여 성능 향상
-def generate_and_load_data():
-    """더미 데이터를 생성하고 DataFrame으로 반환합니다."""
-    data = {}
-    for student_id in range(1, num_students + 1):
-        student_name = f'Student_{student_id}'
-        for subject_kor, subject_eng in subject_map.items():
-            for exam_num in range(1, num_exams + 1):
-                column_name = f'{subject_eng}_Exam_{exam_num}'
-                # 각 시험 점수는 0점에서 100점 사이의 정수로 무작위 생성
-                score = np.random.randint(0, 101)
-                if student_name not in data:
-                    data[student_name] = {}
-                data[student_name][column_name] = score
-    df = pd.DataFrame.from_dict(data, orient='index')
-    df.index.name = 'Student_Name'
-    return df
-
-df = generate_and_load_data()
+MAX_SELECT_OPTIONS = 5000 # 학생 수가 이보다 많으면 selectbox 대신 번호로 선택
+EXPORT_DIR = os.path.join(tempfile.gettempdir(), 'grade_reports') # 리포트 zip 임시 파일 위치
+EXPORT_MAX_AGE = 6 * 3600 # 이보다 오래된 zip은 버려진 세션의 것으로 보고 삭제 (초)
+
+def remove_export(path: str):
+    """내보내기 zip 임시 파일을 지웁니다 (이미 없으면 무시)."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def new_export_path() -> str:
+    """새 내보내기 zip 경로. 세션이 끝나 아무도 지우지 않은 오래된 zip도 이때 정리합니다."""
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    cutoff = time.time() - EXPORT_MAX_AGE
+    for entry in os.scandir(EXPORT_DIR):
+        if entry.is_file() and entry.stat().st_mtime < cutoff:
+            remove_export(entry.path)
+    fd, path = tempfile.mkstemp(prefix='grade_reports_', suffix='.zip', dir=EXPORT_DIR)
+    os.close(fd)
+    return path
+
+st.sidebar.header('Data Settings')
+data_source = st.sidebar.radio('Data source', ('Synthetic', 'Upload file', 'Local file path'))
+
+# 성적부는 읽기 전용이라 rerun마다 복사(pickle)하지 않도록 cache_resource로 공유
+@st.cache_resource(max_entries=5) # 설정값이 바뀌지 않는 한 캐싱하여 성능 향상 (최근 5개 설정만 보관)
+def generate_and_load_data(num_students: int, num_exams: int, seed: int) -> Gradebook:
+    """더미 데이터를 생성하고 uint8 성적부로 반환합니다."""
+    # 각 시험 점수는 0점에서 100점 사이의 정수로 무작위 생성 (학생 × 과목 × 시험 한 번에)
+    return generate_gradebook(num_students, subjects_english, num_exams, seed)
+
+# 실제 성적 파일(수 GB의 long 형식)은 청크 단위로 읽어 같은 성적부 형태로 피벗.
+# 파일 객체는 해시하지 않고(_source) 업로드 ID 또는 경로+크기+수정시각을 키로 캐싱 (최근 5개 파일만 보관)
+@st.cache_resource(show_spinner='Loading gradebook file...', max_entries=5)
+def load_gradebook_file(file_key: str, _source) -> Gradebook:
+    """long 형식(student, subject, exam, score) 파일을 성적부로 적재합니다."""
+    return ingest_long_file(_source, key=file_key)
+
+if data_source == 'Synthetic':
+    # 데이터 규모/재현성 설정 (부하 테스트용으로 학생 수 최대 100만 명)
+    num_students = st.sidebar.number_input('Number of students', 10, 1_000_000, 150, step=10)
+    num_exams = st.sidebar.number_input('Exams per subject', 2, 50, 10) # 각 과목별 시험 횟수
+    seed = st.sidebar.number_input('Random seed', 0, 2**31 - 1, 42)
+    gb = generate_and_load_data(num_students, num_exams, seed)
+else:
+    file_help = f"Long-format CSV or Parquet with columns: {', '.join(LONG_COLUMNS)}"
+    if data_source == 'Upload file':
+        source = st.sidebar.file_uploader('Gradebook file', type=['csv', 'parquet'], help=file_help)
+        file_key = source and f'upload-{source.file_id}'
+    else:
+        source = st.sidebar.text_input('Gradebook file path', help=file_help).strip() or None
+        if source and not os.path.isfile(source):
+            st.sidebar.error(f'File not found: {source}')
+            source = None
+        file_key = source and f'file-{os.path.abspath(source)}-{os.stat(source).st_size}-{os.stat(source).st_mtime_ns}'
+    if source is None:
+        st.info('Choose a gradebook file in the sidebar to start.')
+        st.stop()
+    try:
+        gb = load_gradebook_file(file_key, source)
+    except (ValueError, KeyError) as e:
+        st.error(f'Could not load the gradebook file: {e}')
+        st.stop()
+    st.sidebar.caption(f'{gb.num_students:,} students × {len(gb.subjects)} subjects × {gb.num_exams} exams')
+
+# --- 새 시험 결과 추가 ---
+# 덧붙인 성적부는 세션에 원본 키별로 보관. 회귀는 충분통계량만 갱신하므로(학생·과목당 O(1))
+# 전체 이력을 다시 적합하지 않고, 예측·리더보드는 새 성적부 키로 다시 캐싱된다.
+appended_books = st.session_state.setdefault('appended_gradebooks', {})
+base_gb = gb
+base_key = gb.key
+gb = appended_books.get(base_key, gb)
+
+with st.sidebar.expander('Add exam results'):
+    st.caption(f'Appends exam {gb.num_exams + 1}. Long-format CSV with columns: student, subject, score')
+    new_exam_file = st.file_uploader('New exam file', type=['csv'], key='new_exam_file')
+    if new_exam_file is not None and st.button('Append uploaded exam'):
+        try:
+            new_column = pivot_exam_column(pd.read_csv(new_exam_file), gb)
+            appended_books[base_key] = gb = gb.append_exam(new_column)
+        except (ValueError, KeyError) as e:
+            st.error(f'Could not append the exam: {e}')
+    if data_source == 'Synthetic' and st.button('Simulate next exam'):
+        rng = np.random.default_rng([seed, gb.num_exams])
+        appended_books[base_key] = gb = gb.append_exam(rng.integers(0, 101, size=gb.scores.shape[:2]))
+    if base_key in appended_books and st.button('Discard added exams'):
+        del appended_books[base_key]
+        gb = base_gb
+
+df = gb.frame # 기존 표/통계 화면용 pandas 뷰 (메모리 공유)
+
+def select_student(label: str, key: str = None) -> str:
+    """학생을 고릅니다. 학생 수가 많으면 옵션 전체를 브라우저로 보내지 않도록 번호로 입력받습니다."""
+    if gb.num_students <= MAX_SELECT_OPTIONS:
+        return st.selectbox(label, gb.students.tolist(), key=key)
+    number = st.number_input(f'{label} (Student number 1–{gb.num_students})', 1, gb.num_students, 1, key=key)
+    return gb.students[number - 1]
+
+# 차트는 PNG로 렌더링해 (성적부, 학생[, 난이도]) 단위로 캐싱 → 같은 학생을 다시 보면 재래스터화 없음
+@st.cache_data(show_spinner=False, max_entries=500)
+def analysis_charts(gradebook_key: str, student: str) -> tuple:
+    """과목별 평균 막대 그래프와 과목별 추이 격자 PNG를 반환합니다."""
+    from grade_charts import render_average_bar, render_trend_grid
+    scores = gb.student_scores(student)
+    return (render_average_bar(student, gb.subjects, scores.mean(axis=1)),
+            render_trend_grid(student, gb.subjects, scores))
+
+@st.cache_data(show_spinner=False, max_entries=500)
+def student_intervals(gradebook_key: str, student: str, n_boot: int) -> tuple:
+    """학생 한 명의 과목별 부트스트랩 예측 구간 (하한, 상한) — 난이도 보정 전."""
+    # 모든 재표본이 (과목 × 시험) @ (시험 × 재표본) 행렬 곱 한 번이라 수천 회도 즉시 계산
+    i = gb.students.get_loc(student)
+    return bootstrap_intervals(gb.scores[i], n_boot, INTERVAL_LEVEL)
+
+@st.cache_data(show_spinner=False, max_entries=500)
+def prediction_chart(gradebook_key: str, student: str, difficulty_label: str, difficulty_adjustment: int,
+                     n_boot: int) -> bytes:
+    """과목별 실제 점수 + 다음 시험 예측(부트스트랩 구간 포함) 격자 PNG를 반환합니다."""
+    from grade_charts import render_prediction_grid
+    i = gb.students.get_loc(student)
+    predicted = adjust_predictions(gb.raw_predictions[i], difficulty_adjustment)
+    lower, upper = student_intervals(gradebook_key, student, n_boot)
+    interval = (adjust_predictions(lower, difficulty_adjustment), adjust_predictions(upper, difficulty_adjustment))
+    return render_prediction_grid(student, gb.subjects, gb.scores[i], predicted, difficulty_label,
+                                  interval, f'{INTERVAL_LEVEL:.0%} Prediction Interval')
 
 # --- Streamlit 앱 구성 ---
 st.title('📚 학생 성적 분석 및 예측 시스템')
@@ -47,7 +154,7 @@ st.write("학생들의 과목별 시험 성적을 분석하고, 다음 시험 
 st.sidebar.header('Menu')
 analysis_type = st.sidebar.radio(
     "Select Analysis Type:",
-    ('Data Overview', 'Grade Analysis', 'Grade Prediction')
+    ('Data Overview', 'Grade Analysis', 'Grade Prediction', 'Report Export')
 )
 
 # --- 1. Data Overview (데이터 개요) ---
@@ -73,50 +180,25 @@ elif analysis_type == 'Grade Analysis':
     st.header('📈 Student Grade Analysis')
 
     # 학생 선택 드롭다운
-    selected_student = st.selectbox(
-        'Select a student for grade analysis:',
-        df.index.tolist()
-    )
+    selected_student = select_student('Select a student for grade analysis:')
 
     if selected_student:
         st.subheader(f'**{selected_student}**\'s Average Scores by Subject')
-        student_scores = df.loc[selected_student]
+        student_scores = gb.student_scores(selected_student) # (과목, 시험)
 
         # 과목별 평균 성적 계산
-        subject_avg_scores = {}
-        for subject_eng in subjects_english:
-            subject_exam_cols = [col for col in student_scores.index if col.startswith(subject_eng)]
-            if subject_exam_cols:
-                subject_scores_values = student_scores[subject_exam_cols].astype(float)
-                subject_avg_scores[subject_eng] = subject_scores_values.mean()
-
-        avg_scores_df = pd.DataFrame(subject_avg_scores.items(), columns=['Subject', 'Average Score'])
+        avg_scores_df = pd.DataFrame({'Subject': gb.subjects,
+                                      'Average Score': student_scores.mean(axis=1)})
         st.dataframe(avg_scores_df.set_index('Subject'))
 
+        bar_png, trend_png = analysis_charts(gb.key, selected_student)
+
         # 막대 그래프 시각화
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.barplot(x='Subject', y='Average Score', data=avg_scores_df, ax=ax, palette='viridis')
-        ax.set_ylim(0, 100)
-        ax.set_title(f'{selected_student}\'s Average Scores by Subject')
-        ax.set_ylabel('Average Score (Points)')
-        st.pyplot(fig)
-        plt.close(fig) # 그래프 메모리 해제
+        st.image(bar_png)
 
         st.subheader(f'**{selected_student}**\'s Exam Score Trend by Subject')
-        # 각 과목별 시험 점수 추이 그래프
-        for subject_eng in subjects_english:
-            exam_columns = [col for col in df.columns if col.startswith(f'{subject_eng}_Exam_')]
-            if exam_columns:
-                fig_line, ax_line = plt.subplots(figsize=(10, 4))
-                subject_exam_scores = df.loc[selected_student, exam_columns].astype(float)
-                ax_line.plot(range(1, num_exams + 1), subject_exam_scores, marker='o')
-                ax_line.set_title(f'{selected_student}\'s {subject_eng} Exam Score Trend')
-                ax_line.set_xlabel('Exam Number')
-                ax_line.set_ylabel('Score')
-                ax_line.set_xticks(range(1, num_exams + 1))
-                ax_line.set_ylim(0, 100)
-                st.pyplot(fig_line)
-                plt.close(fig_line)
+        # 각 과목별 시험 점수 추이 그래프 (서브플롯 격자 하나)
+        st.image(trend_png)
 
 # --- 3. Grade Prediction (성적 예측) ---
 elif analysis_type == 'Grade Prediction':
@@ -124,75 +206,46 @@ elif analysis_type == 'Grade Prediction':
     st.write("Predicts the next exam score based on previous exam scores.")
 
     # 예측할 학생 선택
-    student_for_prediction = st.selectbox(
+    student_for_prediction = select_student(
         'Select a student to predict next exam score:',
-        df.index.tolist(),
         key='prediction_student_select'
     )
 
     # 시험 난이도 선택
-    difficulty_mapping = {
-        'Easy (쉬움)': 5,   # 점수 +5점 효과
-        'Normal (보통)': 0, # 점수 변화 없음
-        'Hard (어려움)': -5 # 점수 -5점 효과
-    }
     selected_difficulty = st.radio(
         "Select the difficulty of the next exam:",
-        list(difficulty_mapping.keys())
+        list(DIFFICULTY_ADJUSTMENTS.keys())
     )
-    difficulty_adjustment = difficulty_mapping[selected_difficulty]
+    difficulty_adjustment = DIFFICULTY_ADJUSTMENTS[selected_difficulty]
+    n_boot = st.select_slider('Bootstrap resamples (prediction interval):', [200, 500, 1000, 2000, 5000], 1000)
 
+    # 전체 학생 × 과목 × 시험 배열과 다음 시험 원예측 (X가 항상 1..num_exams라 닫힌 형태 회귀).
+    # 원예측은 성적부마다 한 번만 계산되고, 난이도·범위 제한·순위는 여기서 읽을 때 적용하므로
+    # 난이도를 바꿔도 회귀를 다시 돌리지 않는다.
+    all_predictions = gb.raw_predictions if gb.num_exams >= 2 else None
 
     if student_for_prediction:
         st.subheader(f'**{student_for_prediction}**\'s Next Exam Score Prediction Results (Difficulty: {selected_difficulty})')
 
         predictions = {}
-        for subject_eng in subjects_english:
-            exam_columns = [col for col in df.columns if col.startswith(f'{subject_eng}_Exam_')]
-            if len(exam_columns) >= 2: # 최소 2개 이상의 시험 데이터가 있어야 예측 가능
-                # 특징 (X): 이전 시험 회차
-                # 타겟 (y): 해당 시험 점수
-                # 예측 모델 학습을 위해 학생의 해당 과목 성적만 추출
-                subject_scores = df.loc[student_for_prediction, exam_columns].astype(float)
-                X = np.array(range(1, len(subject_scores) + 1)).reshape(-1, 1)
-                y = subject_scores.values
-
-                # 선형 회귀 모델 학습
-                model = LinearRegression()
-                try:
-                    model.fit(X, y)
-                except ValueError:
-                    # 데이터가 너무 적거나 문제가 있는 경우 (예: 모든 점수가 동일하여 분산이 0)
-                    predictions[subject_eng] = "Prediction not possible (insufficient data variation)"
-                    continue # 다음 과목으로 넘어감
-
-                # 다음 시험 (num_exams + 1) 예측
-                next_exam_num = num_exams + 1
-                predicted_score = model.predict(np.array([[next_exam_num]]))
-
-                # 난이도 조절 반영
-                predicted_score_adjusted = predicted_score[0] + difficulty_adjustment
-
-                # 점수 범위를 0-100으로 제한
-                predicted_score_adjusted = np.clip(predicted_score_adjusted, 0, 100)
-                predictions[subject_eng] = f'{predicted_score_adjusted:.2f} points'
-
-                # 예측 추이 그래프
-                fig_pred, ax_pred = plt.subplots(figsize=(10, 5))
-                ax_pred.plot(X.flatten(), y, marker='o', label='Actual Scores')
-                ax_pred.plot(next_exam_num, predicted_score_adjusted, marker='X', color='red', markersize=10, label=f'Predicted Score ({selected_difficulty})')
-                ax_pred.set_title(f'{student_for_prediction}\'s {subject_eng} Next Exam Prediction')
-                ax_pred.set_xlabel('Exam Number')
-                ax_pred.set_ylabel('Score')
-                ax_pred.set_xticks(list(range(1, num_exams + 1)) + [next_exam_num])
-                ax_pred.set_ylim(0, 100)
-                ax_pred.legend()
-                st.pyplot(fig_pred)
-                plt.close(fig_pred)
-
+        student_idx = gb.students.get_loc(student_for_prediction)
+        if all_predictions is not None:
+            # 시험을 복원추출해 다시 적합한 예측 + 재표본 잔차의 분위수 = 다음 시험 점수의 예측 구간 (난이도 보정도 동일하게 적용)
+            lower, upper = (adjust_predictions(bound, difficulty_adjustment)
+                            for bound in student_intervals(gb.key, student_for_prediction, n_boot))
+        for j, subject_eng in enumerate(gb.subjects):
+            if all_predictions is not None: # 최소 2개 이상의 시험 데이터가 있어야 예측 가능
+                # 다음 시험 (num_exams + 1) 예측: 난이도 조절 반영 후 점수 범위를 0-100으로 제한
+                predicted_score_adjusted = adjust_predictions(all_predictions[student_idx, j], difficulty_adjustment)
+                predictions[subject_eng] = (f'{predicted_score_adjusted:.2f} points '
+                                            f'({INTERVAL_LEVEL:.0%} prediction interval: {lower[j]:.2f} – {upper[j]:.2f})')
             else:
                 predictions[subject_eng] = "Not enough data (requires at least 2 exams)"
 
+        # 예측 추이 그래프 (과목별 서브플롯 격자 하나)
+        if all_predictions is not None:
+            st.image(prediction_chart(gb.key, student_for_prediction, selected_difficulty, difficulty_adjustment, n_boot))
+
         # 예측 결과 요약
         st.write("---")
         st.subheader('Prediction Summary for Selected Student')
@@ -201,43 +254,74 @@ elif analysis_type == 'Grade Prediction':
 
     # --- 시험을 가장 잘 볼 것으로 예측되는 학생 (성적 예측 섹션으로 이동) ---
     st.write("---") # 구분선
-    st.subheader('🏆 Top Predicted Student for Next Exam (by Subject, all students)')
+    st.subheader('🏆 Top Predicted Students for Next Exam (by Subject, all students)')
     st.write(f"Based on linear regression prediction and '{selected_difficulty}' difficulty, here are the students likely to score highest in the next exam for each subject across all students.")
 
-    top_predicted_students = {}
-
-    for subject_eng in subjects_english:
-        max_predicted_score = -1
-        top_student_name = "N/A"
-
-        for student_name in df.index:
-            exam_columns = [col for col in df.columns if col.startswith(f'{subject_eng}_Exam_')]
-            if len(exam_columns) >= 2: # 최소 2개 이상의 시험 데이터가 있어야 예측 가능
-                subject_scores = df.loc[student_name, exam_columns].astype(float)
-                X = np.array(range(1, len(subject_scores) + 1)).reshape(-1, 1)
-                y = subject_scores.values
-
-                model = LinearRegression()
-                try:
-                    model.fit(X, y)
-                    next_exam_num = num_exams + 1
-                    predicted_score = model.predict(np.array([[next_exam_num]]))
-                    
-                    # 난이도 조절 반영
-                    predicted_score_adjusted = predicted_score[0] + difficulty_adjustment
-                    predicted_score_adjusted = np.clip(predicted_score_adjusted, 0, 100) # 0-100 범위 제한
-
-                    if predicted_score_adjusted > max_predicted_score:
-                        max_predicted_score = predicted_score_adjusted
-                        top_student_name = student_name
-                except ValueError:
-                    # 데이터가 너무 적거나 문제가 있는 경우 (예: 모든 점수가 동일하여 분산이 0)
-                    pass # 이 학생은 예측에서 제외
-
-        if top_student_name != "N/A":
-            top_predicted_students[subject_eng] = f'**{top_student_name}** ({max_predicted_score:.2f} points)'
-        else:
-            top_predicted_students[subject_eng] = "No prediction possible (insufficient data for all students)"
-
-    for subject, info in top_predicted_students.items():
-        st.write(f"- **{subject}**: {info}")
+    top_k_size = st.slider('Leaderboard size (Top-K):', 1, 50, 10)
+
+    if all_predictions is not None:
+        # 난이도 조절 후 0-100 범위 제한, 과목별 + 전 과목 평균 상위 K명 (부분 선택, 동점 포함)
+        adjusted_predictions = adjust_predictions(all_predictions, difficulty_adjustment)
+        boards = {subject_eng: adjusted_predictions[:, j] for j, subject_eng in enumerate(gb.subjects)}
+        boards['Overall Average'] = adjusted_predictions.mean(axis=1)
+
+        for tab, (board_name, values) in zip(st.tabs(list(boards)), boards.items()):
+            with tab:
+                board = leaderboard(values, gb.students, top_k_size)
+                st.dataframe(board.head(top_k_size).set_index('Rank'))
+                extra_ties = len(board) - top_k_size
+                if extra_ties > 0:
+                    st.caption(f"+ {extra_ties} more student(s) tied at rank {board['Rank'].iloc[top_k_size - 1]} "
+                               f"({board['Predicted Score'].iloc[top_k_size - 1]:.2f} points)")
+    else:
+        st.write("No prediction possible (insufficient data for all students)")
+
+# --- 4. Report Export (학생별 리포트 일괄 내보내기) ---
+elif analysis_type == 'Report Export':
+    st.header('🗂️ Batch Report Export')
+    st.write("Generates a report (subject averages, trend charts, next exam prediction) for every student and bundles them into one zip file.")
+
+    report_format = st.radio('Report format:', ('HTML', 'PDF'), horizontal=True)
+    export_difficulty = st.radio('Next exam difficulty:', list(DIFFICULTY_ADJUSTMENTS.keys()),
+                                 index=1, horizontal=True)
+    export_adjustment = DIFFICULTY_ADJUSTMENTS[export_difficulty]
+    st.caption(f'{gb.num_students:,} reports. Chart rendering runs in a process pool; larger cohorts take minutes.')
+
+    export_id = (gb.key, report_format, export_adjustment)
+    report_zip = st.session_state.get('report_zip')
+    if report_zip is not None and report_zip[0] != export_id:
+        # 설정이 바뀌어 더는 내려받을 수 없는 이전 내보내기 파일은 바로 지운다
+        remove_export(report_zip[1])
+        del st.session_state['report_zip']
+    if gb.num_exams < 2:
+        st.write("No prediction possible (insufficient data for all students)")
+    elif st.button('Generate reports'):
+        # matplotlib·프로세스 풀은 이 모드에서만 필요하므로 여기서 import
+        from report_export import export_reports
+        progress_bar = st.progress(0)
+        status_text = st.empty()
+
+        def show_progress(done: int, total: int):
+            progress_bar.progress(done / total)
+            status_text.text(f'{done:,} / {total:,} reports written')
+
+        # zip은 메모리가 아니라 임시 파일에 쓰고, 세션에는 경로만 보관
+        # (다운로드 버튼 클릭으로 rerun 되어도 다시 만들지 않음). 이전 내보내기 파일은 지운다.
+        zip_path = new_export_path()
+        try:
+            with open(zip_path, 'wb') as zip_file:
+                export_reports(gb, zip_file, report_format.lower(), export_difficulty, export_adjustment,
+                               progress=show_progress)
+        except BaseException:
+            remove_export(zip_path)  # 중단·실패한 내보내기의 반쪽 파일을 남기지 않음
+            raise
+        previous = st.session_state.get('report_zip')
+        if previous is not None:
+            remove_export(previous[1])
+        st.session_state['report_zip'] = (export_id, zip_path)
+
+    report_zip = st.session_state.get('report_zip')
+    if report_zip is not None and os.path.exists(report_zip[1]):
+        with open(report_zip[1], 'rb') as zip_file:
+            st.download_button('Download reports (.zip)', zip_file,
+                               file_name=f'grade_reports_{report_format.lower()}.zip', mime='application/zip')
@@ -1,9 +1,50 @@
 import streamlit as st
 import plotly.express as px
+import plotly.graph_objects as go
 import pandas as pd
+import hashlib
+import os
+
+from plot_data import (LINE_POINTS_PER_PX, SCATTER_POINT_BUDGET, WEBGL_ROWS, TableFile,
+                       aggregate_bar, density_grid, downsample_line, histogram_counts,
+                       make_random_data, sample_rows)
 
 st.set_page_config(layout="wide") # 페이지 레이아웃을 넓게 설정
 
+# 수백만 행 데이터는 rerun마다 복사(pickle)하지 않도록 cache_resource로 공유 (읽기 전용)
+@st.cache_resource(show_spinner="랜덤 데이터 생성 중...")
+def load_random_data(num_rows: int, seed: int) -> pd.DataFrame:
+    return make_random_data(num_rows, seed)
+
+# 파일 데이터셋은 내용 키(업로드는 내용 해시, 로컬 파일은 경로+크기+수정시각)로 공유.
+# 읽은 컬럼은 TableFile 안에 남으므로 차트 유형을 바꿔도 파일을 다시 읽지 않는다.
+@st.cache_resource(show_spinner="파일 여는 중...", max_entries=5)
+def load_table_file(data_key: str, _source) -> TableFile:
+    return TableFile(_source)
+
+# 대용량 모드의 축소/집계 결과는 작으므로 (데이터셋 키, 컬럼, 점 수) 단위로 cache_data에 캐싱.
+# 원본 프레임(_df)은 해시하지 않고 data_key로 구분한다.
+@st.cache_data(show_spinner=False, max_entries=100)
+def line_points(data_key: str, _df: pd.DataFrame, x_col: str, y_col: str, n_out: int) -> pd.DataFrame:
+    return downsample_line(_df, x_col, y_col, n_out)
+
+@st.cache_data(show_spinner=False, max_entries=100)
+def scatter_points(data_key: str, _df: pd.DataFrame, columns: tuple, n: int) -> pd.DataFrame:
+    return sample_rows(_df[list(columns)], n)
+
+@st.cache_data(show_spinner=False, max_entries=100)
+def bar_totals(data_key: str, _df: pd.DataFrame, x_col: str, y_col: str) -> pd.DataFrame:
+    return aggregate_bar(_df, x_col, y_col)
+
+# 히스토그램·밀도 격자는 NumPy로 서버에서 세고 구간별 개수만 전송 (컬럼 × 구간 수 단위 캐싱)
+@st.cache_data(show_spinner=False, max_entries=100)
+def histogram_bins(data_key: str, _df: pd.DataFrame, col: str, bins: int) -> pd.DataFrame:
+    return histogram_counts(_df[col], bins)
+
+@st.cache_data(show_spinner=False, max_entries=100)
+def density_bins(data_key: str, _df: pd.DataFrame, x_col: str, y_col: str, bins: int) -> tuple:
+    return density_grid(_df[x_col], _df[y_col], bins)
+
 st.title("📊 스트림릿과 플롯리를 이용한 인터랙티브 그래프")
 st.write("간단한 데이터셋으로 다양한 플롯리 그래프를 그려보세요!")
 
@@ -11,22 +52,61 @@ st.write("간단한 데이터셋으로 다양한 플롯리 그래프를 그려
 st.header("1. 데이터 선택 및 미리보기")
 data_option = st.selectbox(
     "데이터셋을 선택하세요:",
-    ("랜덤 데이터", "아이리스 데이터")
+    ("랜덤 데이터", "아이리스 데이터", "파일 업로드 (CSV/Parquet)", "로컬 파일 경로")
 )
+table = None # 파일 데이터셋이면 컬럼 단위 지연 로딩 객체
 
 if data_option == "랜덤 데이터":
     st.subheader("랜덤 데이터 생성")
-    num_rows = st.slider("데이터 행 개수:", 10, 1000, 100)
-    df = pd.DataFrame({
-        "x": [i * 0.1 for i in range(num_rows)],
-        "y": [i**2 + 5 * i + 10 + (pd.np.random.randn() * 20) for i in range(num_rows)],
-        "category": [f"Category {(i % 3) + 1}" for i in range(num_rows)]
-    })
+    # 부하 테스트용으로 최대 500만 행까지 (NumPy 벡터 연산으로 한 번에 생성)
+    num_rows = st.slider("데이터 행 개수:", 10, 5_000_000, 100, step=10)
+    seed = st.number_input("랜덤 시드:", 0, 2**31 - 1, 42)
+    df = load_random_data(num_rows, seed)
+    data_key = f"random-{num_rows}-{seed}"
     st.dataframe(df.head())
-else:
+elif data_option == "아이리스 데이터":
     st.subheader("아이리스(붓꽃) 데이터셋")
     df = px.data.iris() # 플롯리에 내장된 아이리스 데이터셋 사용
+    data_key = "iris"
+    st.dataframe(df.head())
+else:
+    st.subheader("내 데이터 파일")
+    if data_option == "파일 업로드 (CSV/Parquet)":
+        source = st.file_uploader("CSV 또는 Parquet 파일:", type=["csv", "parquet"])
+        if source is not None:
+            # 업로드 내용 해시는 파일마다 한 번만 계산 (rerun마다 전체를 다시 해시하지 않도록)
+            digests = st.session_state.setdefault("upload_digests", {})
+            if source.file_id not in digests:
+                digests.clear() # 세션에는 현재 업로드의 해시만 보관
+                digests[source.file_id] = hashlib.blake2b(source.getbuffer(), digest_size=16).hexdigest()
+            data_key = "upload-" + digests[source.file_id]
+    else:
+        source = st.text_input("파일 경로 (.csv / .parquet):").strip() or None
+        if source and not os.path.isfile(source):
+            st.error(f"파일을 찾을 수 없습니다: {source}")
+            source = None
+        if source:
+            stat = os.stat(source)
+            data_key = f"file-{os.path.abspath(source)}-{stat.st_size}-{stat.st_mtime_ns}"
+    if source is None:
+        st.info("파일을 선택하면 미리보기와 그래프 설정이 표시됩니다.")
+        st.stop()
+    try:
+        table = load_table_file(data_key, source)
+    except (ValueError, OSError) as e:
+        st.error(f"파일을 읽을 수 없습니다: {e}")
+        st.stop()
+    # 미리보기와 컬럼 목록·형식은 앞쪽 표본에서, 실제 데이터는 차트에 쓰는 컬럼만 읽는다
+    df = table.sample
     st.dataframe(df.head())
+    st.caption(f"미리보기는 앞쪽 {len(df):,}행 표본입니다. 그래프는 선택한 컬럼만 읽어서 그립니다.")
+
+def chart_frame(*columns) -> pd.DataFrame:
+    """차트에 쓰는 컬럼의 데이터 (파일이면 그 컬럼만 청크 단위로 읽어 캐싱)."""
+    if table is None:
+        return df
+    with st.spinner("선택한 컬럼 읽는 중..."):
+        return table.frame([c for c in columns if c != "선택 안함"])
 
 st.write("---")
 
@@ -37,6 +117,15 @@ chart_type = st.selectbox(
     ("산점도 (Scatter Plot)", "라인 차트 (Line Chart)", "막대 그래프 (Bar Chart)", "히스토그램 (Histogram)")
 )
 
+# 대용량 모드: 행이 많으면 WebGL 트레이스를 쓰고, 브라우저로 보내는 점 수를 차트 폭에 맞춰 제한
+total_rows = table.num_rows if table is not None else len(df)
+large_data = total_rows > WEBGL_ROWS
+render_mode = "webgl" if large_data else "auto"
+if large_data:
+    plot_width = st.slider("차트 폭 (픽셀, 라인 차트 축소 기준):", 300, 2000, 800, step=50)
+    st.info(f"대용량 모드: {total_rows:,}행 → WebGL 렌더링, 라인 차트는 LTTB로 약 {plot_width * LINE_POINTS_PER_PX:,}점, "
+            f"산점도는 무작위 {SCATTER_POINT_BUDGET:,}점, 막대 그래프는 서버에서 합계로 집계해 보냅니다.")
+
 col1, col2 = st.columns(2)
 
 with col1:
@@ -46,29 +135,59 @@ with col1:
         y_col = st.selectbox("Y축 선택:", df.columns)
         color_col = st.selectbox("색상으로 그룹화 (선택 사항):", ["선택 안함"] + list(df.columns))
         size_col = st.selectbox("크기로 표현 (선택 사항):", ["선택 안함"] + list(df.select_dtypes(include=['number']).columns))
+        df = chart_frame(x_col, y_col, color_col, size_col)
+        numeric_xy = all(pd.api.types.is_numeric_dtype(df[c]) for c in (x_col, y_col))
+        # 점이 빽빽하면 개별 점 대신 2차원 밀도 격자(색상·크기 설정은 사용 안 함)
+        show_density = numeric_xy and st.checkbox("2차원 밀도 히트맵으로 보기", value=large_data)
+        if show_density:
+            density_size = st.slider("격자 크기 (구간 수):", 10, 300, 100)
 
-        if color_col != "선택 안함" and size_col != "선택 안함":
-            fig = px.scatter(df, x=x_col, y=y_col, color=color_col, size=size_col, title=f"{x_col} vs {y_col} 산점도")
-        elif color_col != "선택 안함":
-            fig = px.scatter(df, x=x_col, y=y_col, color=color_col, title=f"{x_col} vs {y_col} 산점도")
-        elif size_col != "선택 안함":
-            fig = px.scatter(df, x=x_col, y=y_col, size=size_col, title=f"{x_col} vs {y_col} 산점도")
+        if show_density:
+            x_centers, y_centers, counts = density_bins(data_key, df, x_col, y_col, density_size)
+            fig = go.Figure(go.Heatmap(x=x_centers, y=y_centers, z=counts, colorscale="Viridis",
+                                       colorbar=dict(title="count")))
+            fig.update_layout(title=f"{x_col} vs {y_col} 밀도 히트맵", xaxis_title=x_col, yaxis_title=y_col)
         else:
-            fig = px.scatter(df, x=x_col, y=y_col, title=f"{x_col} vs {y_col} 산점도")
+            plot_df = df
+            if large_data:
+                used = tuple(dict.fromkeys(c for c in (x_col, y_col, color_col, size_col) if c != "선택 안함"))
+                plot_df = scatter_points(data_key, df, used, SCATTER_POINT_BUDGET)
+            if color_col != "선택 안함" and size_col != "선택 안함":
+                fig = px.scatter(plot_df, x=x_col, y=y_col, color=color_col, size=size_col, title=f"{x_col} vs {y_col} 산점도", render_mode=render_mode)
+            elif color_col != "선택 안함":
+                fig = px.scatter(plot_df, x=x_col, y=y_col, color=color_col, title=f"{x_col} vs {y_col} 산점도", render_mode=render_mode)
+            elif size_col != "선택 안함":
+                fig = px.scatter(plot_df, x=x_col, y=y_col, size=size_col, title=f"{x_col} vs {y_col} 산점도", render_mode=render_mode)
+            else:
+                fig = px.scatter(plot_df, x=x_col, y=y_col, title=f"{x_col} vs {y_col} 산점도", render_mode=render_mode)
 
     elif chart_type == "라인 차트 (Line Chart)":
         x_col = st.selectbox("X축 선택:", df.columns)
         y_col = st.selectbox("Y축 선택:", df.columns)
-        fig = px.line(df, x=x_col, y=y_col, title=f"{x_col} vs {y_col} 라인 차트")
+        df = chart_frame(x_col, y_col)
+        plot_df = line_points(data_key, df, x_col, y_col, plot_width * LINE_POINTS_PER_PX) if large_data else df
+        fig = px.line(plot_df, x=x_col, y=y_col, title=f"{x_col} vs {y_col} 라인 차트", render_mode=render_mode)
 
     elif chart_type == "막대 그래프 (Bar Chart)":
         x_col = st.selectbox("X축 (범주) 선택:", df.columns)
         y_col = st.selectbox("Y축 (값) 선택:", df.columns)
-        fig = px.bar(df, x=x_col, y=y_col, title=f"{x_col}별 {y_col} 막대 그래프")
+        df = chart_frame(x_col, y_col)
+        plot_df = bar_totals(data_key, df, x_col, y_col) if large_data else df
+        fig = px.bar(plot_df, x=x_col, y=y_col, title=f"{x_col}별 {y_col} 막대 그래프")
 
     elif chart_type == "히스토그램 (Histogram)":
         x_col = st.selectbox("데이터 분포를 볼 컬럼 선택:", df.columns)
-        fig = px.histogram(df, x=x_col, title=f"{x_col} 분포 히스토그램")
+        num_bins = st.slider("구간 수:", 5, 200, 50)
+        df = chart_frame(x_col)
+        counts = histogram_bins(data_key, df, x_col, num_bins)
+        if "value" in counts: # 범주형 컬럼은 값별 개수
+            fig = px.bar(counts, x="value", y="count", title=f"{x_col} 분포 히스토그램")
+        else:
+            fig = go.Figure(go.Bar(x=counts["center"], y=counts["count"], width=counts["right"] - counts["left"],
+                                   customdata=counts[["left", "right"]],
+                                   hovertemplate="%{customdata[0]:.4g} – %{customdata[1]:.4g}<br>count: %{y}<extra></extra>"))
+            fig.update_layout(title=f"{x_col} 분포 히스토그램", xaxis_title=x_col, yaxis_title="count", bargap=0)
+        fig.update_xaxes(title=x_col)
 
 with col2:
     st.subheader("생성된 그래프")
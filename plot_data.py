@@ -0,0 +1,232 @@
+# plot_data.py ───────────────────────────────────────────────────────
+# 플롯리 그래프 페이지용 데이터 도우미: 예시 랜덤 데이터를 NumPy 배열 연산으로
+# 한 번에 만들고, 수 GB의 CSV/Parquet은 차트에 필요한 컬럼만 청크 단위로 읽는다.
+# 큰 데이터는 서버에서 축소·집계해 브라우저로 보내는 양을 제한한다.
+# ─────────────────────────────────────────────────────────────────
+import threading
+
+import numpy as np
+import pandas as pd
+
+NUM_CATEGORIES = 3
+
+
+def make_random_data(num_rows: int, seed: int = 42) -> pd.DataFrame:
+    """x, 이차 추세 + 잡음 y, 세 개 범주를 갖는 랜덤 데이터 (같은 seed면 같은 데이터).
+
+    범주 컬럼은 문자열 수백만 개 대신 category 형식으로 만들어 메모리를 아낍니다.
+    """
+    rng = np.random.default_rng(seed)
+    i = np.arange(num_rows, dtype=np.float64)
+    categories = [f"Category {n}" for n in range(1, NUM_CATEGORIES + 1)]
+    return pd.DataFrame({
+        "x": i * 0.1,
+        "y": i ** 2 + 5 * i + 10 + rng.standard_normal(num_rows) * 20,
+        "category": pd.Categorical.from_codes(np.arange(num_rows) % NUM_CATEGORIES, categories),
+    })
+
+
+# ───── 대용량 차트 모드: 브라우저로 보내는 점 수를 행 수와 무관하게 제한 ─────
+WEBGL_ROWS = 20_000             # 이보다 행이 많으면 WebGL 트레이스 + 서버 측 축소
+SCATTER_POINT_BUDGET = 100_000  # 산점도로 보내는 최대 점 수
+LINE_POINTS_PER_PX = 2          # 라인 차트는 차트 폭 1픽셀당 점 2개면 모양이 유지됨
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets로 모양을 보존하며 고른 n_out개 점의 위치.
+
+    첫·끝 점은 항상 포함하고, 가운데를 n_out-2개 구간으로 나눠 구간마다 (직전 선택 점,
+    다음 구간 평균점)과 이루는 삼각형 넓이가 가장 큰 점을 고릅니다. 다음 구간 평균은
+    누적합으로 한 번에 구하므로 반복은 구간 수(차트 폭 수준)만큼만 돕니다.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    cx, cy = np.r_[0, np.cumsum(x)], np.r_[0, np.cumsum(y)]
+    lengths = np.diff(edges)
+    avg_x = (cx[edges[1:]] - cx[edges[:-1]]) / lengths
+    avg_y = (cy[edges[1:]] - cy[edges[:-1]]) / lengths
+    # 마지막 구간의 "다음 구간 평균"은 끝 점
+    next_x, next_y = np.r_[avg_x[1:], x[-1]], np.r_[avg_y[1:], y[-1]]
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        area = np.abs((x[a] - next_x[b]) * (y[lo:hi] - y[a])
+                      - (x[a] - x[lo:hi]) * (next_y[b] - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[b + 1] = a
+    return selected
+
+
+def downsample_line(df: pd.DataFrame, x_col: str, y_col: str, n_out: int) -> pd.DataFrame:
+    """라인 차트용으로 행 순서(그리는 순서)를 유지한 채 n_out개 행으로 줄입니다.
+
+    x가 단조 증가하는 숫자면 x 기준으로, 아니면 행 위치 기준으로 LTTB를 적용하고,
+    y가 숫자가 아니면 일정 간격으로 고릅니다.
+    """
+    data = df[[x_col, y_col]].dropna() if x_col != y_col else df[[x_col]].dropna()
+    if len(data) <= n_out:
+        return data
+    if not pd.api.types.is_numeric_dtype(data[y_col]):
+        return data.iloc[np.linspace(0, len(data) - 1, n_out).astype(np.int64)]
+    x = data[x_col]
+    if pd.api.types.is_numeric_dtype(x) and x.is_monotonic_increasing:
+        positions = x.to_numpy()
+    else:
+        positions = np.arange(len(data))
+    return data.iloc[lttb_indices(positions, data[y_col].to_numpy(), n_out)]
+
+
+def sample_rows(df: pd.DataFrame, n: int, seed: int = 0) -> pd.DataFrame:
+    """행 순서를 유지한 무작위 표본 n행 (행이 n개 이하면 그대로)."""
+    if len(df) <= n:
+        return df
+    rng = np.random.default_rng(seed)
+    return df.iloc[np.sort(rng.choice(len(df), size=n, replace=False))]
+
+
+def aggregate_bar(df: pd.DataFrame, x_col: str, y_col: str) -> pd.DataFrame:
+    """막대 그래프용 x별 y 합계. px.bar가 같은 x의 행을 쌓아 그리는 결과와 같은 높이입니다."""
+    if x_col == y_col or not pd.api.types.is_numeric_dtype(df[y_col]):
+        return df.groupby(x_col, observed=True).size().rename(y_col).reset_index()
+    return df.groupby(x_col, observed=True, sort=True)[y_col].sum().reset_index()
+
+
+# ───── 서버 측 구간 집계: 전송량이 행 수가 아니라 구간 수에 비례 ─────
+def histogram_counts(values: pd.Series, bins: int) -> pd.DataFrame:
+    """히스토그램 막대(구간 시작·끝·가운데·개수). 숫자가 아니면 값별 개수를 셉니다."""
+    if not pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+        counts = values.value_counts(sort=False)
+        return pd.DataFrame({"value": counts.index.astype(str), "count": counts.to_numpy()})
+    data = values.to_numpy(dtype=np.float64)
+    counts, edges = np.histogram(data[np.isfinite(data)], bins=bins)
+    return pd.DataFrame({"left": edges[:-1], "right": edges[1:],
+                         "center": (edges[:-1] + edges[1:]) / 2, "count": counts})
+
+
+def density_grid(x: pd.Series, y: pd.Series, bins: int):
+    """2차원 밀도 격자 (x 구간 가운데, y 구간 가운데, (y, x) 개수 배열)."""
+    xv, yv = x.to_numpy(dtype=np.float64), y.to_numpy(dtype=np.float64)
+    finite = np.isfinite(xv) & np.isfinite(yv)
+    counts, x_edges, y_edges = np.histogram2d(xv[finite], yv[finite], bins=bins)
+    return (x_edges[:-1] + x_edges[1:]) / 2, (y_edges[:-1] + y_edges[1:]) / 2, counts.T
+
+
+# ───── 파일 데이터: 필요한 컬럼만 청크 단위로 지연 로딩 ─────
+PREVIEW_ROWS = 1_000
+CSV_CHUNK_ROWS = 1_000_000
+CATEGORY_MAX_RATIO = 0.5  # 고유값 비율이 이보다 낮은 문자열 컬럼은 category로
+
+
+def downcast(s: pd.Series, as_category: bool = None) -> pd.Series:
+    """정수·실수는 가장 작은 형식으로, 반복이 많은 문자열은 category로 줄입니다.
+
+    `as_category`를 주면 문자열 컬럼의 category 변환 여부를 고유값 비율 대신 그 값으로
+    정합니다 (청크마다 판단이 갈리지 않도록 첫 청크의 결정을 넘길 때).
+    """
+    if pd.api.types.is_bool_dtype(s):
+        return s
+    if pd.api.types.is_integer_dtype(s):
+        return pd.to_numeric(s, downcast="integer")
+    if pd.api.types.is_float_dtype(s):
+        return pd.to_numeric(s, downcast="float")
+    if pd.api.types.is_object_dtype(s) or pd.api.types.is_string_dtype(s):
+        if as_category is None:
+            as_category = s.nunique() < CATEGORY_MAX_RATIO * len(s)
+        if as_category:
+            return s.astype("category")
+    return s
+
+
+def _concat(parts: list) -> pd.Series:
+    """청크별 조각을 합칩니다. category는 범주를 합치고, 숫자는 청크마다 고른 최소
+    형식(int8·int16·float32 …)을 모두 담는 공통 형식 하나로 맞춘 뒤 합칩니다."""
+    if all(isinstance(p.dtype, pd.CategoricalDtype) for p in parts):
+        return pd.Series(pd.api.types.union_categoricals(parts), name=parts[0].name)
+    if all(isinstance(p.dtype, np.dtype) and p.dtype.kind in "iuf" for p in parts):
+        common = np.result_type(*(p.dtype for p in parts))
+        parts = [p.astype(common, copy=False) for p in parts]
+    return pd.concat(parts, ignore_index=True)
+
+
+class TableFile:
+    """CSV/Parquet 파일을 컬럼 단위로 지연 로딩하는 데이터셋.
+
+    열 때는 앞쪽 `PREVIEW_ROWS`행 표본(미리보기·컬럼 목록용)만 읽고, `frame(columns)`가
+    처음 요청된 컬럼만 청크 단위로 읽어 downcast한 뒤 보관하므로 차트 유형을 바꿔도
+    이미 읽은 컬럼은 다시 읽지 않습니다. `source`는 경로 또는 파일 객체입니다.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.is_parquet = str(getattr(source, "name", source)).lower().endswith(".parquet")
+        self._loaded = {}
+        self._lock = threading.Lock()
+        if self.is_parquet:
+            import pyarrow.parquet as pq
+            self._parquet = pq.ParquetFile(source)
+            batch = next(self._parquet.iter_batches(batch_size=PREVIEW_ROWS), None)
+            self.sample = batch.to_pandas() if batch is not None else \
+                self._parquet.schema_arrow.empty_table().to_pandas()
+        else:
+            self.sample = pd.read_csv(self._rewound(), nrows=PREVIEW_ROWS)
+        self.columns = list(self.sample.columns)
+
+    def _rewound(self):
+        if hasattr(self.source, "seek"):
+            self.source.seek(0)
+        return self.source
+
+    @property
+    def num_rows(self) -> int:
+        """전체 행 수 (Parquet은 메타데이터, CSV는 줄 수를 세어 한 번만 계산)."""
+        if not hasattr(self, "_num_rows"):
+            if self.is_parquet:
+                self._num_rows = self._parquet.metadata.num_rows
+            else:
+                with self._lock:
+                    self._num_rows = self._count_csv_rows()
+        return self._num_rows
+
+    def _count_csv_rows(self) -> int:
+        source = self._rewound()
+        f = open(source, "rb") if isinstance(source, (str, bytes)) or hasattr(source, "__fspath__") else source
+        try:
+            lines, last = 0, b"\n"
+            while block := f.read(1 << 24):
+                lines += block.count(b"\n")
+                last = block[-1:]
+        finally:
+            if f is not source:
+                f.close()
+        return lines + (last != b"\n") - 1  # 마지막 줄 개행 없음 보정, 헤더 제외
+
+    def frame(self, columns) -> pd.DataFrame:
+        """요청한 컬럼만의 DataFrame (아직 안 읽은 컬럼만 파일을 한 번 훑어 읽음)."""
+        columns = list(dict.fromkeys(columns))
+        with self._lock:
+            missing = [c for c in columns if c not in self._loaded]
+            if missing:
+                self._loaded.update(self._read(missing))
+            return pd.DataFrame({c: self._loaded[c] for c in columns})
+
+    def _read(self, columns: list) -> dict:
+        parts = {c: [] for c in columns}
+        if self.is_parquet:
+            chunks = (b.to_pandas() for b in
+                      self._parquet.iter_batches(batch_size=CSV_CHUNK_ROWS, columns=columns))
+        else:
+            chunks = pd.read_csv(self._rewound(), usecols=columns, chunksize=CSV_CHUNK_ROWS)
+        as_category = {}  # 컬럼별 category 여부는 첫 청크에서 정해 이후 청크에도 그대로 적용
+        for chunk in chunks:
+            for c in columns:
+                part = downcast(chunk[c], as_category.get(c))
+                as_category.setdefault(c, isinstance(part.dtype, pd.CategoricalDtype))
+                parts[c].append(part)
+        return {c: _concat(p) if p else self.sample[c].iloc[:0] for c, p in parts.items()}
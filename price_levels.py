@@ -0,0 +1,60 @@
+# price_levels.py ────────────────────────────────────────────────────
+# 다중 해상도 가격: 일별 종가(날짜 × 종목)에서 일/주/월 OHLC 단계를 미리 만들어 두고,
+# 보이는 기간에 맞는 가장 촘촘한 단계를 골라 차트 점 수를 일정 수준 이하로 유지한다.
+# 기간이 20년이든 종목이 늘든 차트로 보내는 양은 MAX_POINTS × 종목 수를 넘지 않는다.
+# ─────────────────────────────────────────────────────────────────
+import pandas as pd
+
+# (단계 이름, resample 규칙) — 촘촘한 순서. 일봉은 원본 그대로 쓴다.
+# 주·월봉은 구간 시작일(월요일·1일)을 라벨로 써서, 진행 중인 마지막 구간도 마지막 거래일 이전 라벨을 갖는다.
+LEVELS = (("daily", None), ("weekly", "W-MON"), ("monthly", "MS"))
+LEVEL_LABELS = {"daily": "일봉", "weekly": "주봉", "monthly": "월봉"}
+FIELDS = ("open", "high", "low", "close")
+MAX_POINTS = 2000  # 종목당 차트 점 수 상한 (넓은 차트 폭 수준. 일봉 약 5년까지는 그대로 그린다)
+
+
+class PriceLevels:
+    """일별 종가 프레임의 일/주/월 OHLC 단계.
+
+    저장소에는 종가만 있으므로 주·월 OHLC는 구간 안 종가의 처음/최고/최저/마지막이고,
+    일봉은 네 값이 모두 종가입니다.
+    """
+
+    def __init__(self, closes: pd.DataFrame):
+        closes = closes.sort_index()
+        self.levels = {}
+        for name, rule in LEVELS:
+            if rule is None:
+                self.levels[name] = dict.fromkeys(FIELDS, closes)
+                continue
+            bins = closes.resample(rule, label="left", closed="left")
+            frames = {"open": bins.first(), "high": bins.max(),
+                      "low": bins.min(), "close": bins.last()}
+            self.levels[name] = {f: frame.dropna(how="all") for f, frame in frames.items()}
+
+    def _bounds(self, level: str, start, end):
+        """[start, end] 기간이 걸친 점들의 위치 범위 (주·월봉은 start가 속한 구간부터)."""
+        index = self.levels[level]["close"].index
+        stop = index.searchsorted(pd.Timestamp(end), side="right")
+        if dict(LEVELS)[level] is None:
+            return index.searchsorted(pd.Timestamp(start), side="left"), stop
+        return max(index.searchsorted(pd.Timestamp(start), side="right") - 1, 0), stop
+
+    def count(self, level: str, start, end) -> int:
+        """`level` 단계에서 [start, end] 기간에 들어가는 점 수."""
+        first, stop = self._bounds(level, start, end)
+        return int(max(stop - first, 0))
+
+    def choose(self, start, end, max_points: int = MAX_POINTS) -> str:
+        """점 수가 `max_points` 이하인 가장 촘촘한 단계 (모두 넘으면 가장 성긴 단계)."""
+        for name, _ in LEVELS:
+            if self.count(name, start, end) <= max_points:
+                return name
+        return LEVELS[-1][0]
+
+    def window(self, start, end, field: str = "close", level: str = None,
+               max_points: int = MAX_POINTS):
+        """보이는 기간의 (단계 이름, 날짜 × 종목 프레임). `level`을 주면 그 단계를 씁니다."""
+        level = level or self.choose(start, end, max_points)
+        first, stop = self._bounds(level, start, end)
+        return level, self.levels[level][field].iloc[first:stop]
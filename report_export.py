@@ -0,0 +1,138 @@
+# report_export.py ───────────────────────────────────────────────────
+# 학생별 성적 리포트 일괄 내보내기: 과목별 평균, 추이 차트, 다음 시험 예측을
+# 학생마다 HTML(PNG 내장) 또는 PDF 한 파일로 만들고 zip 하나에 묶는다.
+# 차트 렌더링은 학생 묶음 단위로 프로세스 풀에 나눠 맡기고, 끝나는 대로 zip에 바로 쓴다.
+# ─────────────────────────────────────────────────────────────────
+import base64
+import html
+import io
+import multiprocessing
+import re
+import zipfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from gradebook import INTERVAL_LEVEL, Gradebook, adjust_predictions, bootstrap_intervals
+
+FORMATS = ('html', 'pdf')
+BATCH_SIZE = 25  # 작업 하나가 그리는 학생 수 (프로세스 간 전송 횟수를 줄이려고 묶음 단위)
+
+
+def _filenames(students, fmt: str) -> list:
+    """zip 안 파일명. 정리(특수문자 → _) 후 이름이 겹치는 학생은 행 번호를 붙여 구분합니다."""
+    stems = [re.sub(r'[^\w.-]+', '_', str(student)) for student in students]
+    counts = Counter(stems)
+    names, used = [], set()
+    for i, stem in enumerate(stems):
+        if counts[stem] > 1:
+            stem = f'{stem}_{i}'
+        while f'{stem}.{fmt}' in used:  # 번호를 붙인 이름이 다른 학생 이름과 겹치는 경우
+            stem = f'{stem}_{i}'
+        used.add(f'{stem}.{fmt}')
+        names.append(f'{stem}.{fmt}')
+    return names
+
+
+def _html_report(student: str, subjects: list, scores: np.ndarray, predicted: np.ndarray,
+                 lower: np.ndarray, upper: np.ndarray, difficulty_label: str) -> bytes:
+    from grade_charts import render_average_bar, render_prediction_grid, render_trend_grid
+    averages = scores.mean(axis=1)
+    images = [
+        render_average_bar(student, subjects, averages),
+        render_trend_grid(student, subjects, scores),
+        render_prediction_grid(student, subjects, scores, predicted, difficulty_label,
+                               (lower, upper), f'{INTERVAL_LEVEL:.0%} Prediction Interval'),
+    ]
+    rows = ''.join(
+        f'<tr><td>{html.escape(subject)}</td><td>{avg:.2f}</td><td>{pred:.2f}</td>'
+        f'<td>{lo:.2f} – {hi:.2f}</td></tr>'
+        for subject, avg, pred, lo, hi in zip(subjects, averages, predicted, lower, upper))
+    imgs = ''.join(f'<img src="data:image/png;base64,{base64.b64encode(png).decode()}" '
+                   f'style="max-width:100%">' for png in images)
+    name = html.escape(str(student))
+    return (f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{name} Grade Report</title>'
+            f'</head><body><h1>{name} Grade Report</h1>'
+            f'<p>Next exam difficulty: {html.escape(difficulty_label)}</p>'
+            f'<table border="1" cellpadding="4"><tr><th>Subject</th><th>Average Score</th>'
+            f'<th>Predicted Score</th><th>{INTERVAL_LEVEL:.0%} Prediction Interval</th></tr>{rows}</table>'
+            f'{imgs}</body></html>').encode('utf-8')
+
+
+def _pdf_report(student: str, subjects: list, scores: np.ndarray, predicted: np.ndarray,
+                lower: np.ndarray, upper: np.ndarray, difficulty_label: str) -> bytes:
+    from matplotlib.backends.backend_pdf import PdfPages
+    from matplotlib.figure import Figure
+
+    from grade_charts import average_bar_figure, prediction_grid_figure, trend_grid_figure
+    averages = scores.mean(axis=1)
+    summary = Figure(figsize=(10, 1.5 + 0.4 * len(subjects)))
+    ax = summary.subplots()
+    ax.axis('off')
+    ax.set_title(f'{student} Grade Report (next exam difficulty: {difficulty_label})')
+    ax.table(cellText=[[subject, f'{avg:.2f}', f'{pred:.2f}', f'{lo:.2f} – {hi:.2f}']
+                       for subject, avg, pred, lo, hi in zip(subjects, averages, predicted, lower, upper)],
+             colLabels=['Subject', 'Average Score', 'Predicted Score', f'{INTERVAL_LEVEL:.0%} Prediction Interval'],
+             loc='center')
+    figures = [
+        summary,
+        average_bar_figure(student, subjects, averages),
+        trend_grid_figure(student, subjects, scores),
+        prediction_grid_figure(student, subjects, scores, predicted, difficulty_label,
+                               (lower, upper), f'{INTERVAL_LEVEL:.0%} Prediction Interval'),
+    ]
+    buf = io.BytesIO()
+    with PdfPages(buf) as pdf:
+        for fig in figures:
+            pdf.savefig(fig)
+    return buf.getvalue()
+
+
+def _report_worker(students: list, names: list, subjects: list, scores: np.ndarray,
+                   raw_predictions: np.ndarray, fmt: str, difficulty_label: str,
+                   difficulty_adjustment: float, n_boot: int) -> list:
+    """프로세스 풀 작업: 학생 묶음의 리포트를 만들어 (파일명, 바이트) 목록을 반환합니다."""
+    render = _html_report if fmt == 'html' else _pdf_report
+    predicted = adjust_predictions(raw_predictions, difficulty_adjustment)
+    lower, upper = (adjust_predictions(bound, difficulty_adjustment)
+                    for bound in bootstrap_intervals(scores, n_boot, INTERVAL_LEVEL))
+    return [(names[i],
+             render(student, subjects, scores[i], predicted[i], lower[i], upper[i], difficulty_label))
+            for i, student in enumerate(students)]
+
+
+def export_reports(gradebook: Gradebook, out, fmt: str = 'html', difficulty_label: str = 'Normal',
+                   difficulty_adjustment: float = 0, n_boot: int = 1000,
+                   max_workers=None, progress=None) -> int:
+    """성적부 전체 학생의 리포트를 `out`(경로 또는 파일 객체)에 zip으로 씁니다.
+
+    학생을 `BATCH_SIZE`명씩 묶어 프로세스 풀에 보내고, 완료된 묶음부터 zip에 기록하므로
+    전체 리포트를 메모리에 모아 두지 않습니다. `progress(done, total)`는 묶음이 끝날 때마다
+    호출됩니다. 기록한 리포트 수를 반환합니다. 시험이 2회 이상이어야 합니다.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown report format {fmt!r} (choose from {FORMATS})")
+    total = gradebook.num_students
+    raw = gradebook.raw_predictions
+    names = _filenames(gradebook.students, fmt)
+    done = 0
+    # 페이지 스크립트 스레드에서 호출되므로 fork로 잠금 상태를 복제하지 않도록 새 인터프리터로 시작
+    with ProcessPoolExecutor(max_workers=max_workers,
+                             mp_context=multiprocessing.get_context('spawn')) as pool, \
+            zipfile.ZipFile(out, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        futures = [
+            pool.submit(_report_worker, gradebook.students[start:start + BATCH_SIZE].tolist(),
+                        names[start:start + BATCH_SIZE], gradebook.subjects, gradebook.scores[start:start + BATCH_SIZE],
+                        raw[start:start + BATCH_SIZE], fmt, difficulty_label,
+                        difficulty_adjustment, n_boot)
+            for start in range(0, total, BATCH_SIZE)
+        ]
+        for future in as_completed(futures):
+            batch = future.result()
+            for name, data in batch:
+                zf.writestr(name, data)
+            done += len(batch)
+            if progress is not None:
+                progress(done, total)
+    return total
@@ -0,0 +1,80 @@
+# startup_profile.py ─────────────────────────────────────────────────
+# 페이지별 시작 시간 리포트: 각 페이지 파일의 모듈 최상위 import 문만 모아
+# 새 파이썬 프로세스에서 `-X importtime`으로 실행하고, 첫 화면 전에 치르는
+# import 비용을 모듈별로 나눠 보여 준다. (탭/섹션 안의 지연 import는 제외)
+#
+#   python startup_profile.py                 # pages/*.py 전체
+#   python startup_profile.py pages/03_*.py   # 특정 페이지만
+# ─────────────────────────────────────────────────────────────────
+import ast
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+LINE_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+def top_level_imports(path: Path) -> list:
+    """모듈 최상위(try 블록 포함)의 import 문을 소스 그대로 반환합니다."""
+    source = path.read_text(encoding="utf-8")
+    tree = ast.parse(source)
+    stmts = []
+    for node in tree.body:
+        candidates = [node]
+        if isinstance(node, ast.Try):
+            candidates = node.body
+        for stmt in candidates:
+            if isinstance(stmt, (ast.Import, ast.ImportFrom)):
+                stmts.append(ast.get_source_segment(source, stmt))
+    return stmts
+
+
+def import_costs(statements: list) -> list:
+    """새 프로세스에서 import 문을 실행하고 (모듈, 누적 초) 목록을 반환합니다.
+
+    `-X importtime` 출력 중 들여쓰기 없는 항목이 import 문이 직접 불러온
+    모듈이며, 누적 시간에는 그 모듈이 끌어온 하위 모듈이 모두 포함됩니다.
+    """
+    baseline = {name for name, _ in _run_importtime("pass")}  # 인터프리터 기동분 제외
+    costs = [(name, sec) for name, sec in _run_importtime("\n".join(statements))
+             if name not in baseline]
+    return sorted(costs, key=lambda c: c[1], reverse=True)
+
+
+def _run_importtime(code: str) -> list:
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    costs = []
+    for line in proc.stderr.splitlines():
+        m = LINE_RE.match(line)
+        if m and not m.group(3):
+            costs.append((m.group(4), int(m.group(2)) / 1e6))
+    return costs
+
+
+def report(path: Path, top: int = 10) -> str:
+    try:
+        costs = import_costs(top_level_imports(path))
+    except (SyntaxError, RuntimeError) as e:
+        return f"{path.name}: import 실패 — {e}"
+    total = sum(sec for _, sec in costs)
+    lines = [f"{path.name}: 최상위 import {total:.3f}s"]
+    if total <= 0:  # 모두 이미 로드됐거나 기준선에 걸러져 비율을 낼 수 없음
+        return lines[0] + " (측정할 import 없음)"
+    for name, sec in costs[:top]:
+        lines.append(f"    {sec:8.3f}s  {sec / total:6.1%}  {name}")
+    return "\n".join(lines)
+
+
+def main():
+    paths = [Path(p) for p in sys.argv[1:]] or sorted((ROOT / "pages").glob("*.py"))
+    for path in paths:
+        print(report(path))
+
+
+if __name__ == "__main__":
+    main()
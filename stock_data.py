@@ -0,0 +1,225 @@
+# stock_data.py ──────────────────────────────────────────────────────
+# 가격 데이터 수집 레이어: 티커 묶음을 한 번의 다중 티커 요청(배치) 또는
+# 제한된 동시성의 병렬 요청으로 내려받아 종가 와이드 프레임으로 돌려준다.
+# ─────────────────────────────────────────────────────────────────
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Mapping
+
+import numpy as np
+import pandas as pd
+
+STORE_DIR = Path(__file__).resolve().parent / ".cache" / "prices"
+# 겹치는 날 종가가 이 상대오차보다 다르면 분할·배당으로 수정주가 기준이 바뀐 것으로 본다
+ADJUST_RTOL = 1e-5
+
+# fetcher(티커 목록, 시작일, 종료일(미포함)) -> 티커별 종가 컬럼을 가진 DataFrame
+Fetcher = Callable[[list, object, object], pd.DataFrame]
+
+# yf.download는 결과·오류를 모듈 전역 dict에 모으고 호출마다 비우므로 동시에 두 번 부르면 섞인다
+_DOWNLOAD_LOCK = threading.Lock()
+
+
+def yf_fetcher(tickers: list, start, end) -> pd.DataFrame:
+    """yfinance로 종가 와이드 프레임을 반환합니다.
+
+    티커가 하나면 전역 상태가 없는 `Ticker.history`로 받아 여러 스레드에서 동시에
+    불러도 안전하고, 여럿이면 다중 티커 요청 한 번(내부 스레드 사용)으로 받습니다.
+    """
+    import yfinance as yf  # 디스크 저장소만으로 충분할 때는 로드하지 않는다
+    if len(tickers) == 1:
+        hist = yf.Ticker(tickers[0]).history(start=start, end=end, auto_adjust=True)
+        if hist.empty:
+            return pd.DataFrame(columns=tickers, dtype="float64")
+        close = hist[["Close"]].set_axis(tickers, axis=1)
+        if close.index.tz is not None:  # download와 같이 거래소 현지 날짜의 naive 인덱스로
+            close.index = close.index.tz_localize(None)
+        return close
+    with _DOWNLOAD_LOCK:
+        df = yf.download(tickers, start=start, end=end, progress=False,
+                         auto_adjust=True, group_by="column", threads=True)
+    if df.empty:
+        return pd.DataFrame(columns=tickers, dtype="float64")
+    return df.xs("Close", axis=1, level=0)
+
+
+def frame_fetcher(frame: pd.DataFrame, latency: float = 0.0) -> Fetcher:
+    """미리 준비한 종가 프레임(로컬 픽스처)을 잘라 주는 fetcher를 만듭니다.
+
+    `latency`초만큼 호출마다 대기해 네트워크 왕복을 흉내 내므로,
+    배치/병렬 방식을 Yahoo 없이 벤치마크할 수 있습니다.
+    """
+    def fetch(tickers: list, start, end) -> pd.DataFrame:
+        if latency:
+            time.sleep(latency)
+        idx = frame.index
+        mask = (idx >= pd.Timestamp(start)) & (idx < pd.Timestamp(end))
+        return frame.loc[mask, frame.columns.intersection(tickers)]
+    return fetch
+
+
+def csv_fetcher(path, latency: float = 0.0) -> Fetcher:
+    """날짜 인덱스 + 티커 컬럼 CSV 픽스처로부터 fetcher를 만듭니다."""
+    frame = pd.read_csv(path, index_col=0, parse_dates=True)
+    return frame_fetcher(frame, latency=latency)
+
+
+def fetch_prices(tickers: Mapping[str, str], start, end,
+                 fetcher: Fetcher = yf_fetcher,
+                 max_workers: int = 1) -> pd.DataFrame:
+    """`tickers`(표시 이름 → 티커) 전체의 종가를 표시 이름 컬럼으로 반환합니다.
+
+    max_workers=1 이면 다중 티커 요청 한 번으로, 2 이상이면 티커별 요청을
+    최대 max_workers 개까지 동시에 보냅니다 (`fetcher`는 단일 티커 호출이
+    스레드 안전해야 하며, `yf_fetcher`는 이때 `Ticker.history`를 씁니다).
+    """
+    symbols = list(tickers.values())
+    if max_workers <= 1 or len(symbols) <= 1:
+        raw = fetcher(symbols, start, end)
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(symbols))) as pool:
+            parts = list(pool.map(lambda tic: fetcher([tic], start, end), symbols))
+        raw = pd.concat(parts, axis=1)
+
+    # 티커마다 자기 거래일만 남긴 뒤 합친다 (휴장일이 다른 시장 대비)
+    return _by_name(tickers, {tic: raw[tic] for tic in raw.columns})
+
+
+def _by_name(tickers: Mapping[str, str], closes: Mapping[str, pd.Series]) -> pd.DataFrame:
+    """티커별 종가를 표시 이름 컬럼의 와이드 프레임으로 합칩니다."""
+    series = {}
+    for name, tic in tickers.items():
+        if tic in closes:
+            s = closes[tic].dropna().astype("float64")
+        else:
+            s = pd.Series(dtype="float64")
+        series[name] = s.rename(tic)
+    return pd.concat(series, axis=1)
+
+
+# ───── 디스크 가격 저장소 ─────
+class PriceStore:
+    """티커별 Parquet 파일에 일별 종가를 보관하는 로컬 저장소.
+
+    요청할 때마다 마지막 저장일 이후의 행만 내려받아 덧붙이므로, 재시작 후에는
+    디스크에서 바로 읽고 갱신은 며칠 치 행만 받습니다. 종가는 수정주가라서 갱신할 때
+    마지막 저장일도 다시 받아 비교하고, 값이 달라졌으면(분할·배당) 그 티커는 저장 범위
+    전체를 다시 받아 교체합니다. 종료일은 포함하지 않으며
+    (yfinance 규칙과 동일), 아직 끝나지 않은 당일 봉이 저장되지 않도록
+    종료일은 보통 오늘 날짜로 넘깁니다. 내려받기는 `fetch_prices`를 거치므로
+    `max_workers`로 배치(1) / 제한된 동시성 병렬(2 이상) 방식을 고를 수 있습니다.
+    """
+
+    def __init__(self, root=STORE_DIR, fetcher: Fetcher = yf_fetcher, max_workers: int = 1):
+        self.root = Path(root)
+        self.fetcher = fetcher
+        self.max_workers = max_workers
+
+    def _path(self, ticker: str) -> Path:
+        return self.root / f"{ticker}.parquet"
+
+    def read(self, ticker: str) -> pd.Series:
+        """저장된 종가 전체를 반환합니다. 없으면 빈 Series."""
+        path = self._path(ticker)
+        if not path.exists():
+            return pd.Series(dtype="float64", name=ticker)
+        return pd.read_parquet(path)["Close"].rename(ticker)
+
+    def _meta_path(self, ticker: str) -> Path:
+        return self.root / f"{ticker}.json"
+
+    def covered_from(self, ticker: str, stored: pd.Series):
+        """이 티커를 어느 날짜부터 요청해 두었는지 (상장일이 늦어 첫 행이 더 늦어도 구분됨).
+
+        메타데이터가 없는 예전 파일은 저장된 첫 행 날짜로 간주합니다.
+        """
+        path = self._meta_path(ticker)
+        if path.exists():
+            return pd.Timestamp(json.loads(path.read_text())["start"])
+        return stored.index[0] if not stored.empty else None
+
+    def _write_meta(self, ticker: str, start: pd.Timestamp) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self._meta_path(ticker)
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps({"start": start.strftime("%Y-%m-%d")}))
+        tmp.replace(path)
+
+    def _write(self, ticker: str, close: pd.Series) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self._path(ticker)
+        tmp = path.with_suffix(".tmp")
+        close.rename("Close").to_frame().to_parquet(tmp)
+        tmp.replace(path)  # 쓰는 도중 죽어도 기존 파일은 온전하게
+
+    def _fetch_groups(self, groups: dict, end):
+        """{시작일: 티커 목록} 묶음마다 요청 한 번씩 보내 (티커, 시작일, 받은 행)을 냅니다."""
+        for since, group in groups.items():
+            new = fetch_prices({tic: tic for tic in group}, since, end,
+                               self.fetcher, self.max_workers)
+            for tic in group:
+                if tic not in new.columns:
+                    continue
+                rows = new[tic].dropna().astype("float64")
+                rows = rows[rows.index >= since]
+                if not rows.empty:
+                    yield tic, since, rows
+
+    @staticmethod
+    def _same_basis(stored: pd.Series, rows: pd.Series) -> bool:
+        """겹치는 날짜의 종가가 저장값과 같은지 (겹치는 날이 없으면 확인할 수 없어 True)."""
+        overlap = stored.index.intersection(rows.index)
+        return bool(np.allclose(rows[overlap], stored[overlap], rtol=ADJUST_RTOL, atol=0))
+
+    def refresh(self, tickers: list, start, end) -> dict:
+        """`tickers`를 [start, end) 구간까지 최신화하고 티커별 종가를 반환합니다."""
+        start = pd.Timestamp(start).normalize()
+        end = pd.Timestamp(end).normalize()
+        stored = {tic: self.read(tic) for tic in tickers}
+
+        # 같은 날짜부터 받아야 하는 티커끼리 묶어 다중 티커 요청 한 번으로 처리
+        groups = {}
+        covered = {}
+        backfill = set()  # 요청 시작일이 저장 범위보다 앞서 처음부터 다시 받는 티커
+        for tic, s in stored.items():
+            covered[tic] = self.covered_from(tic, s)
+            if s.empty or covered[tic] is None or start < covered[tic]:
+                since = start
+                stored[tic] = s.iloc[:0]
+                backfill.add(tic)
+            elif s.index[-1] + pd.Timedelta(days=1) < end:
+                since = s.index[-1]  # 마지막 저장일 하나를 겹쳐 받아 수정주가 기준 확인
+            else:
+                continue
+            if since < end:
+                groups.setdefault(since, []).append(tic)
+
+        rebase = {}  # 수정주가 기준이 바뀌어 저장 범위 전체를 다시 받을 티커 (시작일별)
+        for tic, since, rows in self._fetch_groups(groups, end):
+            if tic in backfill:
+                self._write_meta(tic, since)
+            elif not self._same_basis(stored[tic], rows):
+                rebase.setdefault(covered[tic], []).append(tic)
+                continue
+            merged = pd.concat([stored[tic], rows])
+            merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+            stored[tic] = merged.rename(tic)
+            self._write(tic, stored[tic])
+
+        for tic, _, rows in self._fetch_groups(rebase, end):
+            stored[tic] = rows.rename(tic)
+            self._write(tic, stored[tic])
+
+        return {tic: s[(s.index >= start) & (s.index < end)]
+                for tic, s in stored.items()}
+
+    def series(self, ticker: str, start, end) -> pd.Series:
+        """단일 티커의 [start, end) 종가."""
+        return self.refresh([ticker], start, end)[ticker]
+
+    def prices(self, tickers: Mapping[str, str], start, end) -> pd.DataFrame:
+        """`fetch_prices`와 같은 모양(표시 이름 컬럼)의 와이드 프레임을 반환합니다."""
+        return _by_name(tickers, self.refresh(list(tickers.values()), start, end))
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fast_forecast import INTERVAL_Z, fit_predict
+
+VALUES = ["yhat", "yhat_lower", "yhat_upper"]
+
+
+@pytest.fixture
+def prices():
+    # 매일 거래(코인형) A, 영업일만 거래 B, 일찍 끝난 C, 최근 5행뿐인 D
+    index = pd.date_range("2019-01-01", "2024-12-31", freq="D")
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame(np.exp(rng.normal(0, 0.02, (len(index), 4)).cumsum(axis=0)) * 100,
+                         index=index, columns=list("ABCD"))
+    frame.loc[~index.isin(pd.bdate_range(index[0], index[-1])), "B"] = np.nan
+    frame.loc["2024-10-01":, "C"] = np.nan
+    frame.iloc[:-5, frame.columns.get_loc("D")] = np.nan
+    return frame
+
+
+def test_short_ticker_is_nan_and_does_not_break_batch(prices):
+    result = fit_predict(prices, 30)
+    assert result["D"][VALUES].isna().all().all()
+    for col in "ABC":
+        assert np.isfinite(result[col][VALUES].to_numpy()).all()
+
+
+@pytest.mark.parametrize("col", list("ABC"))
+def test_batch_matches_single_ticker_fit(prices, col):
+    batch = fit_predict(prices, 30)[col]
+    alone = fit_predict(prices[[col]], 30)[col]
+    pd.testing.assert_series_equal(batch["ds"], alone["ds"])
+    np.testing.assert_allclose(batch[VALUES], alone[VALUES], rtol=1e-7)
+
+
+def test_forecast_starts_after_each_tickers_last_observation(prices):
+    forecast = fit_predict(prices, 30)["C"]
+    ahead = forecast[forecast["ds"] > pd.Timestamp("2024-09-30")]["ds"]
+    assert ahead.iloc[0] == pd.Timestamp("2024-10-01")
+    assert ahead.iloc[-1] == pd.Timestamp("2024-10-30")
+    assert len(ahead) == 30
+
+
+def test_band_grows_with_trading_days_not_calendar_days(prices):
+    # 변동성은 거래일당 값이므로 30 달력일 동안 분산은 (거래일 비율 × 일수)만큼 늘어야 한다
+    forecast = fit_predict(prices[["B"]], 30)["B"]
+    closes = prices["B"].dropna()
+    log_close = np.log(closes.to_numpy())
+    ret_var = np.var(np.diff(log_close))
+    rate = (len(closes) - 1) / (closes.index[-1] - closes.index[0]).days
+    width = np.log(forecast["yhat_upper"] / forecast["yhat"]).to_numpy() / INTERVAL_Z
+    growth = width[-1] ** 2 - width[-30] ** 2
+    assert growth == pytest.approx(29 * rate * ret_var, rel=1e-9)
+    assert rate == pytest.approx(5 / 7, rel=0.01)
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from price_levels import LEVELS, PriceLevels
+
+
+@pytest.fixture
+def closes():
+    # 목요일(2025-10-16)에 끝나는 영업일 종가 — 마지막 주·월은 진행 중인 구간
+    index = pd.bdate_range("2015-01-01", "2025-10-16")
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({"A": 100 + rng.normal(size=len(index)).cumsum(),
+                         "B": np.arange(len(index), dtype=float)}, index=index)
+
+
+@pytest.mark.parametrize("level", [name for name, _ in LEVELS])
+def test_last_point_is_last_close(closes, level):
+    levels = PriceLevels(closes)
+    _, frame = levels.window(closes.index[0], closes.index[-1], level=level)
+    pd.testing.assert_series_equal(frame.iloc[-1], closes.iloc[-1], check_names=False)
+
+
+@pytest.mark.parametrize("level", [name for name, _ in LEVELS])
+def test_window_includes_bin_containing_start(closes, level):
+    levels = PriceLevels(closes)
+    start, end = pd.Timestamp("2020-03-18"), pd.Timestamp("2020-09-16")  # 둘 다 수요일
+    _, frame = levels.window(start, end, level=level)
+    assert len(frame) == levels.count(level, start, end)
+    assert frame.iloc[-1]["B"] >= closes.loc[:end, "B"].iloc[-1]
+    assert frame.index[0] <= start
+
+
+def test_choose_keeps_three_years_daily(closes):
+    levels = PriceLevels(closes)
+    end = closes.index[-1]
+    assert levels.choose(end - pd.DateOffset(years=3), end) == "daily"
+    assert levels.choose(closes.index[0], end) != "daily"